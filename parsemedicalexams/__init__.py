@@ -11,6 +11,7 @@ from .extraction import (
     score_transcription_confidence,
     self_consistency,
     transcribe_page,
+    transcribe_page_candidates,
     transcribe_with_retry,
 )
 from .standardization import standardize_exam_types
@@ -31,6 +32,7 @@ __all__ = [
     "self_consistency",
     "classify_document",
     "transcribe_page",
+    "transcribe_page_candidates",
     "score_transcription_confidence",
     "DocumentClassification",
     "standardize_exam_types",
@@ -70,6 +70,16 @@ Examples:
         type=int,
         help="Number of parallel workers (overrides the profile)",
     )
+    parser.add_argument(
+        "--document-workers",
+        type=int,
+        help="Number of documents processed in parallel (overrides the profile)",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=int,
+        help="Cap API requests per minute across all workers (overrides the profile)",
+    )
     parser.add_argument(
         "--pattern", type=str, help="Regex pattern for input files (overrides profile)"
     )
@@ -81,6 +91,11 @@ Examples:
             "Reports what would be processed."
         ),
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached page transcriptions and call the LLM again",
+    )
     parser.add_argument(
         "--audit-outputs",
         action="store_true",
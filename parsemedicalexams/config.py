@@ -23,7 +23,12 @@ DEFAULT_VALIDATION_MODEL_ID = "anthropic/claude-haiku-4.5"
 DEFAULT_OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 DEFAULT_N_EXTRACTIONS = 1
 DEFAULT_MAX_WORKERS = 1
+DEFAULT_DOCUMENT_WORKERS = 1
+DEFAULT_CLASSIFY_MAX_PAGES = 3
 DEFAULT_SUMMARIZE_MAX_INPUT_TOKENS = 100_000
+# Not yet tuned from measured usage; transcriptions log their completion tokens to
+# info.log, and truncated ones are retried once at the ceiling.
+DEFAULT_MAX_COMPLETION_TOKENS = 4096
 DEFAULT_INPUT_FILE_REGEX = r".*\.pdf"
 ENV_FILENAME = ".env"
 ENV_EXAMPLE_FILENAME = ".env.example"
@@ -176,6 +181,20 @@ def _parse_positive_int(value: object, default: int, field_name: str) -> int:
     return parsed
 
 
+def _parse_optional_positive_int(value: object, field_name: str) -> int | None:
+    """Parse an optional positive integer limit; None means unlimited."""
+    if value is None:
+        return None
+    try:
+        parsed = int(str(value))
+    except (TypeError, ValueError):
+        parsed = 0
+    if parsed < 1:
+        logger.warning("%s=%r is not valid. Ignoring it.", field_name, value)
+        return None
+    return parsed
+
+
 def _resolve_profile_path(profile_path: Path, raw_path: str | None) -> Path | None:
     """Resolve a path declared inside a profile."""
     if not raw_path:
@@ -204,7 +223,11 @@ class ProfileConfig:
     validation_model_id: str | None = None
     n_extractions: int = DEFAULT_N_EXTRACTIONS
     max_workers: int = DEFAULT_MAX_WORKERS
+    document_workers: int = DEFAULT_DOCUMENT_WORKERS
+    classify_max_pages: int = DEFAULT_CLASSIFY_MAX_PAGES
     summarize_max_input_tokens: int = DEFAULT_SUMMARIZE_MAX_INPUT_TOKENS
+    max_completion_tokens: int = DEFAULT_MAX_COMPLETION_TOKENS
+    requests_per_minute: int | None = None
 
     full_name: str | None = None
     birth_date: str | None = None
@@ -318,6 +341,22 @@ class ProfileConfig:
                 DEFAULT_MAX_WORKERS,
                 "max_workers",
             ),
+            document_workers=_parse_positive_int(
+                _first_value(
+                    processing.get("document_workers"),
+                    data.get("document_workers"),
+                ),
+                DEFAULT_DOCUMENT_WORKERS,
+                "document_workers",
+            ),
+            classify_max_pages=_parse_positive_int(
+                _first_value(
+                    processing.get("classify_max_pages"),
+                    data.get("classify_max_pages"),
+                ),
+                DEFAULT_CLASSIFY_MAX_PAGES,
+                "classify_max_pages",
+            ),
             summarize_max_input_tokens=_parse_positive_int(
                 _first_value(
                     processing.get("summarize_max_input_tokens"),
@@ -326,6 +365,21 @@ class ProfileConfig:
                 DEFAULT_SUMMARIZE_MAX_INPUT_TOKENS,
                 "summarize_max_input_tokens",
             ),
+            max_completion_tokens=_parse_positive_int(
+                _first_value(
+                    processing.get("max_completion_tokens"),
+                    data.get("max_completion_tokens"),
+                ),
+                DEFAULT_MAX_COMPLETION_TOKENS,
+                "max_completion_tokens",
+            ),
+            requests_per_minute=_parse_optional_positive_int(
+                _first_value(
+                    processing.get("requests_per_minute"),
+                    data.get("requests_per_minute"),
+                ),
+                "requests_per_minute",
+            ),
             full_name=_optional_str(
                 _first_value(
                     _optional_str(patient.get("full_name")),
@@ -377,6 +431,11 @@ class ExtractionConfig:
     validation_model_id: str
     max_workers: int
     summarize_max_input_tokens: int
+    max_completion_tokens: int = DEFAULT_MAX_COMPLETION_TOKENS
+    document_workers: int = DEFAULT_DOCUMENT_WORKERS
+    classify_max_pages: int = DEFAULT_CLASSIFY_MAX_PAGES
+    requests_per_minute: int | None = None
+    use_cache: bool = True
     dry_run: bool = False
 
     @classmethod
@@ -426,4 +485,8 @@ class ExtractionConfig:
             ),
             max_workers=profile.max_workers,
             summarize_max_input_tokens=profile.summarize_max_input_tokens,
+            max_completion_tokens=profile.max_completion_tokens,
+            document_workers=profile.document_workers,
+            classify_max_pages=profile.classify_max_pages,
+            requests_per_minute=profile.requests_per_minute,
         )
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
 import logging
+import multiprocessing
+import os
 import re
 import shutil
 import subprocess
 import tempfile
-from collections.abc import Sequence
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import cast
 
@@ -40,16 +46,28 @@ from .validation import (
 
 logger = logging.getLogger(__name__)
 SKIP_MARKER_FILENAME = ".skip"
+IMAGE_MANIFEST_FILENAME = ".images"
+DONE_MARKER_FILENAME = ".done"
+# Cloud-backed filesystems can preserve mtimes with tiny rounding drift.
+MTIME_TOLERANCE_NS = 1_000
+# Output validation is file-read bound (often on network drives), so documents
+# are checked concurrently.
+OUTPUT_VALIDATION_WORKERS = 8
+# libyaml's C loader/dumper when PyYAML was built with it; same safe subset, ~10x faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+_DOC_DATE_PREFIX_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})\b")
+_ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 
 def extract_doc_date_prefix(name: str) -> str | None:
     """Extract a YYYY-MM-DD prefix from a document stem or filename."""
-    match = re.match(r"^(\d{4}-\d{2}-\d{2})\b", name)
+    match = _DOC_DATE_PREFIX_PATTERN.match(name)
     return match.group(1) if match else None
 
 
 def _is_iso_date_string(value: object) -> bool:
-    return isinstance(value, str) and bool(re.fullmatch(r"\d{4}-\d{2}-\d{2}", value))
+    return isinstance(value, str) and bool(_ISO_DATE_PATTERN.fullmatch(value))
 
 
 def _expected_page_number(md_path: Path, doc_stem: str) -> int | None:
@@ -171,15 +189,40 @@ def validate_metadata_frontmatter(
     return issues
 
 
+def _doc_files(doc_dir: Path, doc_stem: str, suffix: str) -> list[Path]:
+    """Return files named {doc_stem}.*{suffix} in doc_dir, in directory order.
+
+    A single os.scandir pass with string checks: no per-entry fnmatch, and stems
+    containing glob characters like "[" are matched literally.
+    """
+    prefix = f"{doc_stem}."
+    try:
+        with os.scandir(doc_dir) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.name.startswith(prefix)
+                and entry.name[len(prefix) :].endswith(suffix)
+                and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
 def transcription_files(doc_dir: Path, doc_stem: str) -> list[Path]:
     """Return all transcription .md files (excluding .summary.md) in doc_dir."""
     return [
         path
-        for path in doc_dir.glob(f"{doc_stem}.*.md")
+        for path in _doc_files(doc_dir, doc_stem, ".md")
         if not path.name.endswith(".summary.md")
     ]
 
 
+def page_image_files(doc_dir: Path, doc_stem: str) -> list[Path]:
+    """Return all page .jpg files in doc_dir."""
+    return _doc_files(doc_dir, doc_stem, ".jpg")
+
+
 def skip_marker_path(doc_output_dir: Path) -> Path:
     """Return the skip marker path for a document output directory."""
     return doc_output_dir / SKIP_MARKER_FILENAME
@@ -200,6 +243,78 @@ def remove_skip_marker(doc_output_dir: Path) -> None:
         marker.unlink()
 
 
+def image_manifest_path(doc_output_dir: Path) -> Path:
+    """Return the page image manifest path for a document output directory."""
+    return doc_output_dir / IMAGE_MANIFEST_FILENAME
+
+
+def _source_stamp(source_pdf: Path) -> str:
+    source_stat = source_pdf.stat()
+    return (
+        f"source: {source_pdf.name}\n"
+        f"size: {source_stat.st_size}\n"
+        f"mtime_ns: {source_stat.st_mtime_ns}\n"
+    )
+
+
+def _read_source_stamp(marker_path: Path, source_pdf: Path) -> dict[str, object] | None:
+    """Return the marker mapping when it was written for the current source PDF."""
+    if not marker_path.exists():
+        return None
+    try:
+        marker = yaml.load(marker_path.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
+    except (OSError, yaml.YAMLError):
+        return None
+    if not isinstance(marker, dict):
+        return None
+
+    size = marker.get("size")
+    mtime_ns = marker.get("mtime_ns")
+    if not isinstance(size, int) or not isinstance(mtime_ns, int):
+        return None
+    source_stat = source_pdf.stat()
+    if size != source_stat.st_size:
+        return None
+    if abs(mtime_ns - source_stat.st_mtime_ns) > MTIME_TOLERANCE_NS:
+        return None
+    return cast(dict[str, object], marker)
+
+
+def write_image_manifest(doc_output_dir: Path, source_pdf: Path, page_count: int) -> None:
+    """Record which source PDF version the persisted page images were rendered from."""
+    image_manifest_path(doc_output_dir).write_text(
+        f"{_source_stamp(source_pdf)}pages: {page_count}\n",
+        encoding="utf-8",
+    )
+
+
+def cached_image_page_count(doc_output_dir: Path, source_pdf: Path) -> int | None:
+    """Return the manifest page count when it was written for the current source PDF."""
+    manifest = _read_source_stamp(image_manifest_path(doc_output_dir), source_pdf)
+    if manifest is None:
+        return None
+    pages = manifest.get("pages")
+    return pages if isinstance(pages, int) else None
+
+
+def done_marker_path(doc_output_dir: Path) -> Path:
+    """Return the completed-output marker path for a document output directory."""
+    return doc_output_dir / DONE_MARKER_FILENAME
+
+
+def write_done_marker(doc_output_dir: Path, source_pdf: Path) -> None:
+    """Mark a validated output bundle as complete for the current source PDF."""
+    done_marker_path(doc_output_dir).write_text(
+        f"status: done\n{_source_stamp(source_pdf)}",
+        encoding="utf-8",
+    )
+
+
+def done_marker_is_current(doc_output_dir: Path, source_pdf: Path) -> bool:
+    """Return True when the output was validated complete for the current source PDF."""
+    return _read_source_stamp(done_marker_path(doc_output_dir), source_pdf) is not None
+
+
 def pdf_copy_is_current(source_pdf: Path, copied_pdf: Path) -> bool:
     """Return True when the copied PDF still matches the source PDF bytes."""
     if not copied_pdf.exists():
@@ -209,8 +324,7 @@ def pdf_copy_is_current(source_pdf: Path, copied_pdf: Path) -> bool:
     copied_stat = copied_pdf.stat()
     if source_stat.st_size != copied_stat.st_size:
         return False
-    # Cloud-backed filesystems can preserve mtimes with tiny rounding drift.
-    if abs(source_stat.st_mtime_ns - copied_stat.st_mtime_ns) <= 1_000:
+    if abs(source_stat.st_mtime_ns - copied_stat.st_mtime_ns) <= MTIME_TOLERANCE_NS:
         return True
     return _files_have_same_content(source_pdf, copied_pdf)
 
@@ -231,18 +345,53 @@ def _sha256_digest(path: Path) -> bytes:
     return digest.digest()
 
 
+def _count_pdf_pages_with_pdfinfo(pdf_path: Path) -> int | None:
+    """Read the page count from the poppler pdfinfo CLI, if it is installed."""
+    if not shutil.which("pdfinfo"):
+        return None
+    result = subprocess.run(
+        ["pdfinfo", str(pdf_path)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        return None
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "Pages":
+            return int(value) if value.strip().isdigit() else None
+    return None
+
+
 def count_pdf_pages(pdf_path: Path) -> int:
     """Count pages in a PDF, using metadata tools before raster fallback."""
     try:
-        from pdf2image import pdfinfo_from_path  # type: ignore[import-not-found]
-
-        info = pdfinfo_from_path(str(pdf_path))
-        pages = info.get("Pages")
-        if isinstance(pages, int) and pages > 0:
-            return pages
-    except (ImportError, OSError, RuntimeError, TypeError, ValueError):
-        logger.debug("Falling back to raster page counting for %s", pdf_path.name)
+        import pymupdf  # type: ignore[import-not-found]
+    except ModuleNotFoundError:
+        pass
+    else:
+        try:
+            with pymupdf.open(str(pdf_path)) as doc:
+                if doc.page_count > 0:
+                    return doc.page_count
+        except (OSError, RuntimeError, ValueError) as exc:
+            logger.debug("PyMuPDF could not open %s: %s", pdf_path.name, exc)
 
+    try:
+        from pdf2image import pdfinfo_from_path  # type: ignore[import-not-found]
+    except ImportError:
+        pages = _count_pdf_pages_with_pdfinfo(pdf_path)
+    else:
+        try:
+            pages = pdfinfo_from_path(str(pdf_path)).get("Pages")
+        except (OSError, RuntimeError, TypeError, ValueError):
+            pages = None
+
+    if isinstance(pages, int) and pages > 0:
+        return pages
+
+    logger.debug("Falling back to raster page counting for %s", pdf_path.name)
     return len(convert_pdf_to_images(pdf_path))
 
 
@@ -265,20 +414,21 @@ def build_exam_frontmatter(
 def write_markdown_with_frontmatter(
     path: Path, frontmatter: ExamFrontmatter, body: str
 ) -> None:
-    """Write a markdown file with YAML frontmatter."""
-    with path.open("w", encoding="utf-8") as handle:
-        if frontmatter:
-            handle.write("---\n")
-            handle.write(
-                yaml.dump(
-                    frontmatter,
-                    default_flow_style=False,
-                    allow_unicode=True,
-                    sort_keys=False,
-                )
+    """Write a markdown file with YAML frontmatter in a single write."""
+    header = ""
+    if frontmatter:
+        header = (
+            "---\n"
+            + yaml.dump(
+                frontmatter,
+                Dumper=_YAML_DUMPER,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
             )
-            handle.write("---\n\n")
-        handle.write(body)
+            + "---\n\n"
+        )
+    path.write_text(header + body, encoding="utf-8")
 
 
 def purge_derived_outputs(
@@ -295,6 +445,8 @@ def purge_derived_outputs(
     if remove_images:
         for image_path in doc_output_dir.glob(f"{doc_stem}.*.jpg"):
             image_path.unlink()
+        image_manifest_path(doc_output_dir).unlink(missing_ok=True)
+    done_marker_path(doc_output_dir).unlink(missing_ok=True)
     remove_skip_marker(doc_output_dir)
 
 
@@ -366,7 +518,7 @@ def parse_frontmatter(content: str) -> tuple[ExamFrontmatter, str]:
         if end_marker != -1:
             frontmatter_str = transcription[3:end_marker].strip()
             try:
-                frontmatter = _coerce_frontmatter(yaml.safe_load(frontmatter_str))
+                frontmatter = _coerce_frontmatter(yaml.load(frontmatter_str, Loader=_YAML_LOADER))
             except yaml.YAMLError:
                 frontmatter = {}
             transcription = transcription[end_marker + 3 :].strip()
@@ -520,11 +672,15 @@ def get_document_output_issue(pdf_path: Path, output_path: Path) -> str | None:
     if not markdown_files:
         return "missing transcription markdown files"
 
-    jpg_files = list(doc_output_dir.glob(f"{doc_stem}.*.jpg"))
+    jpg_files = page_image_files(doc_output_dir, doc_stem)
     if not jpg_files:
         return "missing page images"
 
-    expected_page_count = count_pdf_pages(copied_pdf)
+    # The image manifest records the page count for this source version, so a
+    # repeat validation does not have to open the PDF.
+    expected_page_count = cached_image_page_count(doc_output_dir, pdf_path)
+    if expected_page_count is None:
+        expected_page_count = count_pdf_pages(copied_pdf)
     if len(jpg_files) != expected_page_count:
         return (
             f"page image count mismatch ({len(jpg_files)} images, "
@@ -558,33 +714,81 @@ def is_document_processed(pdf_path: Path, output_path: Path) -> bool:
     return get_document_output_issue(pdf_path, output_path) is None
 
 
-def convert_pdf_to_images(pdf_path: Path) -> list[Image.Image]:
-    """Convert a PDF into PIL images, using pdftoppm as a fallback."""
+# Pages are downscaled to a 1000px long side afterwards, so rendering above
+# 150 DPI (an A4 page is ~1750px tall) only costs rasterization time.
+PDF_RENDER_DPI = 150
+# pdf2image splits pages across this many pdftoppm processes; leave a core for the rest.
+PDF_RENDER_THREADS = max(1, (os.cpu_count() or 2) - 1)
+# Rendered pages are only an intermediate for preprocessing (downscaled, then saved
+# again at quality 80), so higher quality here just costs encode time and temp disk.
+PDF_RENDER_JPEG_QUALITY = 85
+PREPROCESS_POOL_MIN_PAGES = 8
+# One preprocessing pool shared by all concurrently processed documents, so the
+# worker count stays bounded by the cores instead of multiplying per document.
+_preprocess_pool: ProcessPoolExecutor | None = None
+_preprocess_pool_lock = threading.Lock()
+
+
+def _render_pdf_pages_with_pymupdf(pymupdf, pdf_path: Path, output_dir: Path) -> list[Path]:
+    """Render PDF pages one at a time with PyMuPDF."""
+    rendered_paths: list[Path] = []
+    with pymupdf.open(str(pdf_path)) as doc:
+        for page_index in range(doc.page_count):
+            pix = doc.load_page(page_index).get_pixmap(dpi=PDF_RENDER_DPI)
+            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            del pix
+            rendered_path = output_dir / f"page-{page_index + 1:04d}.jpg"
+            image.save(str(rendered_path), "JPEG", quality=PDF_RENDER_JPEG_QUALITY)
+            rendered_paths.append(rendered_path)
+    return rendered_paths
+
+
+def render_pdf_pages(pdf_path: Path, output_dir: Path) -> list[Path]:
+    """Render PDF pages to JPEG files in output_dir, returning paths in page order."""
+    try:
+        import pymupdf  # type: ignore[import-not-found]
+    except ModuleNotFoundError:
+        pass
+    else:
+        return _render_pdf_pages_with_pymupdf(pymupdf, pdf_path, output_dir)
+
     try:
         from pdf2image import convert_from_path  # type: ignore[import-not-found]
 
-        return convert_from_path(str(pdf_path))
+        rendered_paths = convert_from_path(
+            str(pdf_path),
+            dpi=PDF_RENDER_DPI,
+            output_folder=str(output_dir),
+            fmt="jpeg",
+            jpegopt={"quality": PDF_RENDER_JPEG_QUALITY},
+            paths_only=True,
+            thread_count=PDF_RENDER_THREADS,
+        )
+        return [Path(path) for path in rendered_paths]
     except ModuleNotFoundError:
         if not shutil.which("pdftoppm"):
             raise
 
-        with tempfile.TemporaryDirectory() as render_dir:
-            prefix = Path(render_dir) / "page"
-            result = subprocess.run(
-                ["pdftoppm", "-jpeg", "-r", "150", str(pdf_path), str(prefix)],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.returncode != 0:
-                raise RuntimeError(result.stderr.strip() or "pdftoppm failed")
+        prefix = output_dir / "page"
+        result = subprocess.run(
+            ["pdftoppm", "-jpeg", "-r", str(PDF_RENDER_DPI), str(pdf_path), str(prefix)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or "pdftoppm failed")
+        return sorted(output_dir.glob("page-*.jpg"))
 
-            image_paths = sorted(Path(render_dir).glob("page-*.jpg"))
-            images = []
-            for image_path in image_paths:
-                with Image.open(image_path) as img:
-                    images.append(img.copy())
-            return images
+
+def convert_pdf_to_images(pdf_path: Path) -> list[Image.Image]:
+    """Convert a PDF into PIL images, using pdftoppm as a fallback."""
+    with tempfile.TemporaryDirectory() as render_dir:
+        images = []
+        for image_path in render_pdf_pages(pdf_path, Path(render_dir)):
+            with Image.open(image_path) as img:
+                images.append(img.copy())
+        return images
 
 
 def extract_pdf_page_text(pdf_path: Path, page_num: int) -> str:
@@ -674,10 +878,18 @@ def save_document_summary(
     write_markdown_with_frontmatter(summary_path, frontmatter, summary.strip() + "\n")
 
 
-def copy_source_pdf(source_pdf: Path, doc_output_dir: Path) -> None:
-    """Copy or refresh the source PDF inside a document output directory."""
+def copy_source_pdf(
+    source_pdf: Path, doc_output_dir: Path, copy_is_current: bool | None = None
+) -> None:
+    """Copy or refresh the source PDF inside a document output directory.
+
+    Pass copy_is_current when pdf_copy_is_current was already checked, so drifted
+    mtimes don't cost a second SHA-256 of both files.
+    """
     copied_pdf = doc_output_dir / source_pdf.name
-    if pdf_copy_is_current(source_pdf, copied_pdf):
+    if copy_is_current is None:
+        copy_is_current = pdf_copy_is_current(source_pdf, copied_pdf)
+    if copy_is_current:
         return
     try:
         shutil.copy2(source_pdf, copied_pdf)
@@ -689,47 +901,157 @@ def copy_source_pdf(source_pdf: Path, doc_output_dir: Path) -> None:
         raise
 
 
+def _preprocess_rendered_page(rendered_path: Path, temp_image_path: Path) -> None:
+    """Shrink and enhance one rendered page; top-level so a process pool can run it."""
+    with Image.open(rendered_path) as page_image:
+        processed_image = preprocess_page_image(page_image)
+    # optimize/progressive only re-encode the entropy coding: same pixels, ~10% fewer
+    # bytes stored and uploaded with every transcription request.
+    processed_image.save(
+        str(temp_image_path), "JPEG", quality=80, optimize=True, progressive=True
+    )
+    rendered_path.unlink()
+
+
+def _get_preprocess_pool() -> ProcessPoolExecutor:
+    """Create the shared preprocessing pool on first use."""
+    global _preprocess_pool
+    with _preprocess_pool_lock:
+        if _preprocess_pool is None:
+            # Documents run on threads, and forking a multithreaded process can copy
+            # held locks into the child; start workers from a clean process instead.
+            start_method = (
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+            _preprocess_pool = ProcessPoolExecutor(
+                max_workers=PDF_RENDER_THREADS,
+                mp_context=multiprocessing.get_context(start_method),
+            )
+        return _preprocess_pool
+
+
+def _discard_preprocess_pool(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next long document starts a fresh one."""
+    global _preprocess_pool
+    with _preprocess_pool_lock:
+        # Another document may already have replaced it after hitting the same failure.
+        if _preprocess_pool is executor:
+            _preprocess_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_preprocess_pool() -> None:
+    """Stop the shared preprocessing workers, dropping any queued pages."""
+    global _preprocess_pool
+    with _preprocess_pool_lock:
+        if _preprocess_pool is not None:
+            _preprocess_pool.shutdown(wait=True, cancel_futures=True)
+            _preprocess_pool = None
+
+
 def preprocess_pdf_images_to_temp(pdf_path: Path, doc_stem: str):
     """Convert and preprocess PDF pages into a temporary directory."""
     temp_dir = tempfile.TemporaryDirectory()
     temp_path = Path(temp_dir.name)
-    temp_image_paths: list[Path] = []
+    render_path = temp_path / "render"
+    render_path.mkdir()
 
-    for page_num, page_image in enumerate(convert_pdf_to_images(pdf_path), start=1):
-        processed_image = preprocess_page_image(page_image)
-        temp_image_path = temp_path / f"{doc_stem}.{page_num:03d}.jpg"
-        processed_image.save(str(temp_image_path), "JPEG", quality=80)
-        temp_image_paths.append(temp_image_path)
+    rendered_paths = render_pdf_pages(pdf_path, render_path)
+    temp_image_paths = [
+        temp_path / f"{doc_stem}.{page_num:03d}.jpg"
+        for page_num in range(1, len(rendered_paths) + 1)
+    ]
+
+    # Grayscale/LANCZOS/contrast is CPU-bound PIL work; spread long documents across
+    # cores. Short ones stay in-process since starting workers costs more than it saves.
+    if len(rendered_paths) >= PREPROCESS_POOL_MIN_PAGES and PDF_RENDER_THREADS > 1:
+        executor = _get_preprocess_pool()
+        try:
+            list(executor.map(_preprocess_rendered_page, rendered_paths, temp_image_paths))
+        except BrokenProcessPool:
+            logger.warning(
+                "Preprocessing pool broke while processing %s, finishing in-process",
+                pdf_path.name,
+            )
+            _discard_preprocess_pool(executor)
+    # Finished pages have their rendered file removed, so this only handles the
+    # short-document path and whatever a broken pool left undone.
+    for rendered_path, temp_image_path in zip(rendered_paths, temp_image_paths):
+        if rendered_path.exists():
+            _preprocess_rendered_page(rendered_path, temp_image_path)
 
     return temp_dir, temp_image_paths
 
 
 def persist_temp_images(temp_image_paths: list[Path], doc_output_dir: Path) -> list[Path]:
-    """Copy preprocessed temp images into the document output directory."""
+    """Move preprocessed temp images into the document output directory.
+
+    A rename when the temp dir shares the output filesystem; otherwise
+    shutil.move falls back to copy-and-delete.
+    """
     image_paths: list[Path] = []
     for temp_image_path in temp_image_paths:
         final_image_path = doc_output_dir / temp_image_path.name
-        shutil.copy2(temp_image_path, final_image_path)
+        shutil.move(temp_image_path, final_image_path)
         image_paths.append(final_image_path)
     return image_paths
 
 
 def validate_pipeline_outputs(pdf_files: list[Path], output_path: Path) -> list[str]:
     """Validate expected output files exist and pass content validation."""
-    issues = []
-    for pdf_path in pdf_files:
-        issue = get_document_output_issue(pdf_path, output_path)
-        if issue:
-            issues.append(f"{pdf_path.stem}: {issue}")
-    return issues
+    with ThreadPoolExecutor(max_workers=OUTPUT_VALIDATION_WORKERS) as executor:
+        doc_issues = list(
+            executor.map(
+                lambda pdf_path: get_document_output_issue(pdf_path, output_path), pdf_files
+            )
+        )
+    return [
+        f"{pdf_path.stem}: {issue}"
+        for pdf_path, issue in zip(pdf_files, doc_issues)
+        if issue
+    ]
+
 
+def iter_pdf_files(root: Path) -> Iterator[Path]:
+    """Recursively yield *.pdf files under root, like Path.glob("**/*.pdf").
 
-def validate_orphan_output_dirs(output_path: Path, input_path: Path) -> list[str]:
+    Uses os.scandir so file types come from the directory listing instead of a
+    stat per entry, which matters on large (often network-mounted) archives.
+    Like glob, symlinked directories are not descended into (so symlink loops
+    are harmless), and unreadable directories or entries are skipped.
+    """
+    pdf_paths: list[Path] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".pdf") and entry.is_file():
+                        pdf_paths.append(Path(entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        return
+
+    yield from pdf_paths
+    for subdir in subdirs:
+        yield from iter_pdf_files(Path(subdir))
+
+
+def validate_orphan_output_dirs(
+    output_path: Path,
+    input_path: Path,
+    source_doc_stems: set[str] | None = None,
+) -> list[str]:
     """Validate that every output document directory maps to a source PDF in input_path."""
     if not output_path.exists():
         return []
 
-    source_doc_stems = {pdf_path.stem for pdf_path in input_path.glob("**/*.pdf")}
+    if source_doc_stems is None:
+        source_doc_stems = {pdf_path.stem for pdf_path in iter_pdf_files(input_path)}
     issues: list[str] = []
     for doc_dir in output_path.iterdir():
         if not doc_dir.is_dir() or doc_dir.name == "logs":
@@ -739,44 +1061,52 @@ def validate_orphan_output_dirs(output_path: Path, input_path: Path) -> list[str
     return sorted(issues)
 
 
+def _doc_frontmatter_issues(doc_dir: Path) -> list[str]:
+    doc_stem = doc_dir.name
+    issues = []
+    for md_path in _doc_files(doc_dir, doc_stem, ".md"):
+        try:
+            frontmatter, _ = parse_frontmatter(md_path.read_text(encoding="utf-8"))
+        except OSError as exc:
+            issues.append(f"Error reading {md_path.name}: {exc}")
+            continue
+
+        if not frontmatter:
+            issues.append(f"Missing frontmatter: {md_path.name}")
+            continue
+
+        for problem in validate_metadata_frontmatter(md_path, doc_stem, frontmatter):
+            if problem == "exam_date_mismatch_doc_prefix":
+                exam_date = frontmatter.get("exam_date")
+                expected_doc_date = extract_doc_date_prefix(doc_stem)
+                issues.append(
+                    "Exam date "
+                    f"{exam_date} does not match document date prefix "
+                    f"{expected_doc_date}: {md_path.name}"
+                )
+            else:
+                issues.append(f"{problem}: {md_path.name}")
+    return issues
+
+
 def validate_frontmatter(
     output_path: Path,
     source_doc_stems: set[str] | None = None,
 ) -> list[str]:
     """Validate that all .md files have YAML frontmatter with required fields."""
-    issues = []
     doc_dirs = [
         doc_dir
         for doc_dir in output_path.iterdir()
-        if doc_dir.is_dir() and doc_dir.name != "logs"
+        if doc_dir.is_dir()
+        and doc_dir.name != "logs"
+        and (source_doc_stems is None or doc_dir.name in source_doc_stems)
     ]
-    for doc_dir in doc_dirs:
-        doc_stem = doc_dir.name
-        if source_doc_stems is not None and doc_stem not in source_doc_stems:
-            continue
-        for md_path in doc_dir.glob(f"{doc_stem}.*.md"):
-            try:
-                frontmatter, _ = parse_frontmatter(md_path.read_text(encoding="utf-8"))
-            except OSError as exc:
-                issues.append(f"Error reading {md_path.name}: {exc}")
-                continue
-
-            if not frontmatter:
-                issues.append(f"Missing frontmatter: {md_path.name}")
-                continue
-
-            for problem in validate_metadata_frontmatter(md_path, doc_stem, frontmatter):
-                if problem == "exam_date_mismatch_doc_prefix":
-                    exam_date = frontmatter.get("exam_date")
-                    expected_doc_date = extract_doc_date_prefix(doc_stem)
-                    issues.append(
-                        "Exam date "
-                        f"{exam_date} does not match document date prefix "
-                        f"{expected_doc_date}: {md_path.name}"
-                    )
-                else:
-                    issues.append(f"{problem}: {md_path.name}")
-    return issues
+    with ThreadPoolExecutor(max_workers=OUTPUT_VALIDATION_WORKERS) as executor:
+        return [
+            issue
+            for doc_issues in executor.map(_doc_frontmatter_issues, doc_dirs)
+            for issue in doc_issues
+        ]
 
 
 def collect_output_assertions(
@@ -785,11 +1115,13 @@ def collect_output_assertions(
     input_path: Path,
 ) -> dict[str, list[str]]:
     """Collect post-run output assertions grouped by category."""
-    source_doc_stems = {pdf_path.stem for pdf_path in input_path.glob("**/*.pdf")}
+    source_doc_stems = {pdf_path.stem for pdf_path in iter_pdf_files(input_path)}
     grouped_issues = {
         "output bundle issues": validate_pipeline_outputs(pdf_files, output_path),
         "frontmatter issues": validate_frontmatter(output_path, source_doc_stems),
-        "orphaned output directories": validate_orphan_output_dirs(output_path, input_path),
+        "orphaned output directories": validate_orphan_output_dirs(
+            output_path, input_path, source_doc_stems
+        ),
     }
     return {
         category: issues
@@ -3,11 +3,14 @@
 import base64
 import json
 import logging
+import tempfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
 from typing import Callable, cast
 
-from openai import APIError, OpenAI
+from openai import APIError, APIStatusError, OpenAI
 from openai.types.chat import (
     ChatCompletionContentPartImageParam,
     ChatCompletionContentPartTextParam,
@@ -15,15 +18,25 @@ from openai.types.chat import (
     ChatCompletionNamedToolChoiceParam,
     ChatCompletionToolParam,
 )
+from PIL import Image  # type: ignore[import-untyped]
 from pydantic import BaseModel, Field
 
+from .config import DEFAULT_MAX_COMPLETION_TOKENS
+from .llm_cache import (
+    load_cached_response,
+    make_cache_key,
+    response_lock,
+    save_cached_response,
+)
 from .utils import (
     extract_completion_text,
     extract_dates_from_text,
+    is_anthropic_model,
     load_prompt,
     parse_json_mapping,
     require_completion_text,
     strip_markdown_fences,
+    system_message,
 )
 from .validation import first_blocking_issue, validate_page_output
 
@@ -88,16 +101,43 @@ CLASSIFICATION_TOOL_CHOICE: ChatCompletionNamedToolChoiceParam = {
     "type": "function",
     "function": {"name": "classify_document"},
 }
+TRANSCRIPTION_MAX_TOKENS_CEILING = 16384
+SELF_CONSISTENCY_TEMPERATURE = 0.5
+
+
+# Holds whole base64 page images: preprocessed pages are ~1000px grayscale JPEGs
+# (a few hundred KB encoded), so 64 entries stay in the tens of MB while covering
+# the pages in flight across document and page workers.
+@lru_cache(maxsize=64)
+def _image_data_url(image_path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size are part of the cache key so rewritten images are re-read.
+    img_data = base64.standard_b64encode(Path(image_path).read_bytes()).decode("utf-8")
+    return f"data:image/jpeg;base64,{img_data}"
+
 
 def _encode_image(image_path: Path) -> ChatCompletionContentPartImageParam:
-    with image_path.open("rb") as img_file:
-        img_data = base64.standard_b64encode(img_file.read()).decode("utf-8")
+    # Classification, every retry variant, and self-consistency samples send the
+    # same page, so the base64 payload is encoded once and reused.
+    stat = image_path.stat()
     return {
         "type": "image_url",
-        "image_url": {"url": f"data:image/jpeg;base64,{img_data}"},
+        "image_url": {"url": _image_data_url(str(image_path), stat.st_mtime_ns, stat.st_size)},
     }
 
 
+def _is_truncated(completion: object) -> bool:
+    choices = getattr(completion, "choices", None) or []
+    return any(getattr(choice, "finish_reason", None) == "length" for choice in choices)
+
+
+def _log_completion_usage(completion: object, context: str) -> None:
+    usage = getattr(completion, "usage", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    # INFO so the usage lands in info.log, the data for tuning max_completion_tokens.
+    if completion_tokens is not None:
+        logger.info("Completion tokens for %s: %s", context, completion_tokens)
+
+
 def _parse_classification_tool_args(raw_args: str) -> dict[str, object]:
     parsed = json.loads(raw_args)
     if not isinstance(parsed, dict):
@@ -119,33 +159,36 @@ def self_consistency(
         return result, [result]
 
     results: list[str] = []
-    SELF_CONSISTENCY_TEMPERATURE = 0.5
 
-    with ThreadPoolExecutor(max_workers=n) as executor:
-        futures = []
-        for i in range(n):
-            effective_kwargs = kwargs.copy()
-            if "temperature" in fn.__code__.co_varnames and "temperature" not in kwargs:
-                effective_kwargs["temperature"] = SELF_CONSISTENCY_TEMPERATURE
-            futures.append(executor.submit(fn, *args, **effective_kwargs))
+    call_kwargs = kwargs.copy()
+    if "temperature" in fn.__code__.co_varnames and "temperature" not in kwargs:
+        call_kwargs["temperature"] = SELF_CONSISTENCY_TEMPERATURE
 
-        for future in as_completed(futures):
-            try:
+    # Run one sample on the calling thread so n=2 only needs a single worker.
+    with ThreadPoolExecutor(max_workers=n - 1) as executor:
+        futures = [executor.submit(fn, *args, **call_kwargs) for _ in range(n - 1)]
+        try:
+            results.append(fn(*args, **call_kwargs))
+            for future in as_completed(futures):
                 results.append(future.result())
-            except Exception as exc:
-                logger.error("Error during self-consistency task execution: %s", exc)
-                for f_cancel in futures:
-                    if not f_cancel.done():
-                        f_cancel.cancel()
-                raise
+        except Exception as exc:
+            logger.error("Error during self-consistency task execution: %s", exc)
+            for f_cancel in futures:
+                if not f_cancel.done():
+                    f_cancel.cancel()
+            raise
+
+    return select_consistent_result(results, model_id, fn.__name__, client=client)
 
-    if not results:
-        raise RuntimeError("All self-consistency calls failed.")
 
+def select_consistent_result(
+    results: list[str], model_id: str, fn_name: str, client: OpenAI
+) -> tuple[str, list[str]]:
+    """Return the shared result when all samples agree, otherwise vote on the best one."""
     if all(r == results[0] for r in results):
         return results[0], results
 
-    return vote_on_best_result(results, model_id, fn.__name__, client=client)
+    return vote_on_best_result(results, model_id, fn_name, client=client)
 
 
 def vote_on_best_result(
@@ -176,6 +219,7 @@ def classify_document(
     client: OpenAI,
     temperature: float = 0.1,
     profile_context: str = "",
+    use_cache: bool = False,
 ) -> DocumentClassification:
     """
     Classify whether a document is a medical exam by analyzing all pages.
@@ -185,17 +229,32 @@ def classify_document(
         model_id: Vision model to use for classification
         client: OpenAI client instance
         temperature: Temperature for sampling (low for classification)
+        use_cache: Reuse the classification of identical page images and prompts
 
     Returns:
         DocumentClassification with is_exam, exam_name_raw, exam_date, facility_name
     """
-    image_content = [_encode_image(image_path) for image_path in image_paths]
-
     system_prompt = load_prompt("classification_system")
     system_prompt = system_prompt.format(patient_context=profile_context)
     user_prompt = load_prompt("classification_user")
+
+    cache_key = None
+    if use_cache:
+        cache_key = make_cache_key(
+            *(image_path.read_bytes() for image_path in image_paths),
+            model_id,
+            system_prompt,
+            user_prompt,
+            str(temperature),
+        )
+        cached = load_cached_response("classifications", cache_key)
+        if isinstance(cached, dict):
+            logger.debug("Using cached classification for %s page(s)", len(image_paths))
+            return DocumentClassification.model_validate(cached)
+
+    image_content = [_encode_image(image_path) for image_path in image_paths]
     messages: list[ChatCompletionMessageParam] = [
-        {"role": "system", "content": system_prompt},
+        system_message(system_prompt, model_id),
         {
             "role": "user",
             "content": cast(
@@ -223,7 +282,87 @@ def classify_document(
     exam_date = tool_result_dict.get("exam_date")
     if isinstance(exam_date, str):
         tool_result_dict["exam_date"] = _normalize_date_format(exam_date)
-    return DocumentClassification.model_validate(tool_result_dict)
+    classification = DocumentClassification.model_validate(tool_result_dict)
+    if cache_key:
+        save_cached_response("classifications", cache_key, classification.model_dump())
+    return classification
+
+
+def _create_transcription_completion(
+    image_path: Path,
+    model_id: str,
+    client: OpenAI,
+    temperature: float,
+    max_tokens: int,
+    n: int = 1,
+    prompt_variant: str = "transcription_system",
+    user_prompt_name: str = "transcription_user",
+    user_prompt_text: str = "",
+    profile_context: str = "",
+) -> object:
+    """Request transcription completion(s) for a page.
+
+    Retries once at half resolution when the image is rejected as too large (413),
+    and once at the token ceiling when any choice was truncated.
+    """
+    messages = _build_transcription_messages(
+        image_path,
+        model_id,
+        prompt_variant=prompt_variant,
+        user_prompt_name=user_prompt_name,
+        user_prompt_text=user_prompt_text,
+        profile_context=profile_context,
+    )
+    # Only ask for n when sampling, so single transcriptions keep the plain request shape.
+    n_kwargs: dict[str, int] = {"n": n} if n > 1 else {}
+    try:
+        completion = client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **n_kwargs,
+        )
+    except APIStatusError as exc:
+        if exc.status_code != 413:
+            raise
+        logger.warning(
+            "Image for %s rejected as too large, retrying at half resolution", image_path.name
+        )
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as tmp_file:
+            smaller_path = Path(tmp_file.name)
+            with Image.open(image_path) as img:
+                img.reduce(2).save(smaller_path, "JPEG", quality=80)
+            messages = _build_transcription_messages(
+                smaller_path,
+                model_id,
+                prompt_variant=prompt_variant,
+                user_prompt_name=user_prompt_name,
+                user_prompt_text=user_prompt_text,
+                profile_context=profile_context,
+            )
+        completion = client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **n_kwargs,
+        )
+    if _is_truncated(completion) and max_tokens < TRANSCRIPTION_MAX_TOKENS_CEILING:
+        logger.info(
+            "Transcription of %s hit max_tokens=%s, retrying with %s",
+            image_path.name,
+            max_tokens,
+            TRANSCRIPTION_MAX_TOKENS_CEILING,
+        )
+        completion = client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=TRANSCRIPTION_MAX_TOKENS_CEILING,
+            **n_kwargs,
+        )
+    return completion
 
 
 def transcribe_page(
@@ -235,6 +374,7 @@ def transcribe_page(
     user_prompt_name: str = "transcription_user",
     user_prompt_text: str = "",
     profile_context: str = "",
+    max_tokens: int = DEFAULT_MAX_COMPLETION_TOKENS,
 ) -> str:
     """
     Transcribe all visible text from a page verbatim.
@@ -246,15 +386,164 @@ def transcribe_page(
         temperature: Temperature for sampling (low for OCR)
         prompt_variant: Which system prompt variant to use
         profile_context: Patient context string for prompt formatting
+        max_tokens: Completion budget; retried once at the ceiling when truncated
 
     Returns:
         String with complete verbatim transcription
     """
+    completion = _create_transcription_completion(
+        image_path,
+        model_id,
+        client,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        prompt_variant=prompt_variant,
+        user_prompt_name=user_prompt_name,
+        user_prompt_text=user_prompt_text,
+        profile_context=profile_context,
+    )
+    _log_completion_usage(completion, f"transcription of {image_path.name}")
+    return _parse_transcription_content(
+        require_completion_text(completion, f"transcription of {image_path.name}"),
+        image_path,
+    )
+
+
+def _passes_page_validation(
+    transcription: str, page_kind: str = "text", chart_type: str | None = None
+) -> bool:
+    # Cached transcriptions are re-checked on load too, so an entry that fails the
+    # current page validation rules is re-transcribed instead of replayed forever.
+    issues = validate_page_output(transcription, page_kind=page_kind, chart_type=chart_type)
+    return first_blocking_issue(issues) is None
+
+
+def transcribe_page_candidates(
+    image_path: Path,
+    model_id: str,
+    client: OpenAI,
+    n: int,
+    temperature: float = SELF_CONSISTENCY_TEMPERATURE,
+    profile_context: str = "",
+    max_tokens: int = DEFAULT_MAX_COMPLETION_TOKENS,
+    use_cache: bool = False,
+) -> list[str]:
+    """
+    Sample n transcriptions of a page, sharing one request where the provider allows it.
+
+    Uses the `n` completion parameter so the page image is sent and billed once.
+    Providers that return fewer usable choices (or don't support `n`, like
+    Anthropic models) are topped up with single transcribe_page calls.
+    With use_cache, the sampled set is reused for identical image bytes and prompts.
+    """
+    cache_key = None
+    if use_cache:
+        cache_key = make_cache_key(
+            image_path.read_bytes(),
+            model_id,
+            load_prompt("transcription_system"),
+            load_prompt("transcription_user"),
+            profile_context,
+            f"{n}:{temperature}:{max_tokens}",
+        )
+
+    with response_lock("transcription_candidates", cache_key) if cache_key else nullcontext():
+        if cache_key:
+            cached = load_cached_response("transcription_candidates", cache_key)
+            if (
+                isinstance(cached, list)
+                and len(cached) == n
+                and all(_passes_page_validation(str(candidate)) for candidate in cached)
+            ):
+                logger.debug("Using cached transcription candidates for %s", image_path.name)
+                return [str(candidate) for candidate in cached]
+
+        candidates: list[str] = []
+        if n > 1 and not is_anthropic_model(model_id):
+            completion = _create_transcription_completion(
+                image_path,
+                model_id,
+                client,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                n=n,
+                profile_context=profile_context,
+            )
+            _log_completion_usage(completion, f"transcription candidates of {image_path.name}")
+            for choice in getattr(completion, "choices", None) or []:
+                if getattr(choice, "finish_reason", None) == "length":
+                    continue
+                content = getattr(getattr(choice, "message", None), "content", None)
+                if isinstance(content, str) and content.strip():
+                    candidates.append(_parse_transcription_content(content.strip(), image_path))
+
+        missing = n - len(candidates)
+        if missing > 0:
+            if candidates:
+                logger.debug(
+                    "Provider returned %s of %s candidates for %s, topping up",
+                    len(candidates),
+                    n,
+                    image_path.name,
+                )
+            candidates.extend(
+                _sample_transcriptions(
+                    missing,
+                    image_path,
+                    model_id,
+                    client,
+                    temperature=temperature,
+                    profile_context=profile_context,
+                    max_tokens=max_tokens,
+                )
+            )
+        candidates = candidates[:n]
+        # Only cache sets that pass page validation; a blocking candidate may be the one
+        # selected, and replaying it would fail the page on every retry.
+        if cache_key and all(_passes_page_validation(candidate) for candidate in candidates):
+            save_cached_response("transcription_candidates", cache_key, candidates)
+        return candidates
+
+
+def _sample_transcriptions(
+    count: int,
+    image_path: Path,
+    model_id: str,
+    client: OpenAI,
+    temperature: float,
+    profile_context: str,
+    max_tokens: int,
+) -> list[str]:
+    def sample(_: int) -> str:
+        return transcribe_page(
+            image_path,
+            model_id,
+            client,
+            temperature=temperature,
+            profile_context=profile_context,
+            max_tokens=max_tokens,
+        )
+
+    if count == 1:
+        return [sample(0)]
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(sample, range(count)))
+
+
+def _build_transcription_messages(
+    image_path: Path,
+    model_id: str,
+    prompt_variant: str = "transcription_system",
+    user_prompt_name: str = "transcription_user",
+    user_prompt_text: str = "",
+    profile_context: str = "",
+) -> list[ChatCompletionMessageParam]:
     system_prompt = load_prompt(prompt_variant)
     system_prompt = system_prompt.format(patient_context=profile_context)
     user_prompt = user_prompt_text or load_prompt(user_prompt_name)
-    messages: list[ChatCompletionMessageParam] = [
-        {"role": "system", "content": system_prompt},
+    # Keep the static instructions first and the page image last so prefixes cache.
+    return [
+        system_message(system_prompt, model_id),
         {
             "role": "user",
             "content": cast(
@@ -263,16 +552,10 @@ def transcribe_page(
             ),
         },
     ]
-    completion = client.chat.completions.create(
-        model=model_id,
-        messages=messages,
-        temperature=temperature,
-        max_tokens=16384,
-    )
-    content = strip_markdown_fences(
-        require_completion_text(completion, f"transcription of {image_path.name}")
-    )
 
+
+def _parse_transcription_content(raw_content: str, image_path: Path) -> str:
+    content = strip_markdown_fences(raw_content)
     if content.startswith("{"):
         try:
             parsed = parse_json_mapping(content, f"transcription of {image_path.name}")
@@ -315,6 +598,8 @@ def transcribe_with_retry(
     prompt_variants: list[str] | None = None,
     user_prompt_name: str = "transcription_user",
     user_prompt_text: str = "",
+    max_tokens: int = DEFAULT_MAX_COMPLETION_TOKENS,
+    use_cache: bool = False,
 ) -> tuple[str, str, int]:
     """
     Transcribe page with automatic retry on refusal using different prompt variants.
@@ -327,64 +612,107 @@ def transcribe_with_retry(
         temperature: Temperature for sampling (low for OCR)
         profile_context: Patient context string for prompt formatting
         max_retries: Maximum number of prompt variants to try (default 3 = original + 2 alts)
+        max_tokens: Completion budget passed to each transcription attempt
+        use_cache: Reuse a validated transcription of identical image bytes and prompts
 
     Returns:
         Tuple of (transcription_text, prompt_variant_used, attempts_made)
     """
     variants = prompt_variants or TRANSCRIPTION_PROMPT_VARIANTS
-    transcription = ""
-    for attempt, prompt_variant in enumerate(variants[: max_retries + 1]):
-        try:
-            logger.debug(
-                f"Transcription attempt {attempt + 1} using {prompt_variant} for {image_path.name}"
-            )
-
-            transcription = transcribe_page(
-                image_path=image_path,
-                model_id=model_id,
-                client=client,
-                temperature=temperature,
-                prompt_variant=prompt_variant,
-                user_prompt_name=user_prompt_name,
-                user_prompt_text=user_prompt_text,
-                profile_context=profile_context,
-            )
-
-            is_valid, reason = validate_transcription(
-                transcription,
-                validation_model_id,
-                client,
-                page_kind=page_kind,
-                chart_type=chart_type,
-            )
-
-            if is_valid:
-                if attempt > 0:
-                    logger.info(
-                        f"Transcription succeeded with alternative prompt "
-                        f"({prompt_variant}) on attempt {attempt + 1} for {image_path.name}"
-                    )
-                return transcription, prompt_variant, attempt + 1
-
-            logger.warning(
-                f"Transcription validation failure ({reason}) with {prompt_variant} "
-                f"for {image_path.name}, trying alternative prompt..."
-            )
+    cache_key = None
+    if use_cache:
+        cache_key = make_cache_key(
+            image_path.read_bytes(),
+            model_id,
+            validation_model_id,
+            *(load_prompt(variant) for variant in variants[: max_retries + 1]),
+            user_prompt_text or load_prompt(user_prompt_name),
+            profile_context,
+            f"{temperature}:{max_tokens}:{page_kind}:{chart_type}",
+        )
 
-        except APIError as exc:
-            logger.error(
-                "Transcription failed with %s for %s: %s",
-                prompt_variant,
-                image_path.name,
-                exc,
+    with response_lock("transcriptions", cache_key) if cache_key else nullcontext():
+        if cache_key:
+            cached = load_cached_response("transcriptions", cache_key)
+            if (
+                isinstance(cached, list)
+                and len(cached) == 3
+                and _passes_page_validation(str(cached[0]), page_kind, chart_type)
+            ):
+                logger.debug("Using cached transcription for %s", image_path.name)
+                return str(cached[0]), str(cached[1]), int(cached[2])
+
+        transcription = ""
+        for attempt, prompt_variant in enumerate(variants[: max_retries + 1]):
+            try:
+                logger.debug(
+                    "Transcription attempt %s using %s for %s",
+                    attempt + 1,
+                    prompt_variant,
+                    image_path.name,
+                )
+
+                transcription = transcribe_page(
+                    image_path=image_path,
+                    model_id=model_id,
+                    client=client,
+                    temperature=temperature,
+                    prompt_variant=prompt_variant,
+                    user_prompt_name=user_prompt_name,
+                    user_prompt_text=user_prompt_text,
+                    profile_context=profile_context,
+                    max_tokens=max_tokens,
+                )
+
+                is_valid, reason = validate_transcription(
+                    transcription,
+                    validation_model_id,
+                    client,
+                    page_kind=page_kind,
+                    chart_type=chart_type,
+                )
+
+                if is_valid:
+                    if attempt > 0:
+                        logger.info(
+                            "Transcription succeeded with alternative prompt (%s) "
+                            "on attempt %s for %s",
+                            prompt_variant,
+                            attempt + 1,
+                            image_path.name,
+                        )
+                    # validate_transcription already ran the page validation for this
+                    # page_kind/chart_type, so only pages that pass it are cached.
+                    if cache_key:
+                        save_cached_response(
+                            "transcriptions",
+                            cache_key,
+                            [transcription, prompt_variant, attempt + 1],
+                        )
+                    return transcription, prompt_variant, attempt + 1
+
+                logger.warning(
+                    "Transcription validation failure (%s) with %s for %s, "
+                    "trying alternative prompt...",
+                    reason,
+                    prompt_variant,
+                    image_path.name,
+                )
+
+            except APIError as exc:
+                logger.error(
+                    "Transcription failed with %s for %s: %s",
+                    prompt_variant,
+                    image_path.name,
+                    exc,
+                )
+                continue
+
+        if transcription:
+            raise RuntimeError(
+                f"All prompt variants produced invalid transcription for {image_path.name}"
             )
-            continue
-
-    if transcription:
-        raise RuntimeError(
-            f"All prompt variants produced invalid transcription for {image_path.name}"
-        )
-    raise RuntimeError(f"All prompt variants failed for {image_path.name}")
+        raise RuntimeError(f"All prompt variants failed for {image_path.name}")
 
 
 def validate_transcription(
@@ -0,0 +1,67 @@
+"""Persistent on-disk cache for LLM responses keyed by content hashes."""
+
+import hashlib
+import json
+import logging
+import threading
+import weakref
+
+from .config import get_cache_dir
+from .utils import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = get_cache_dir() / "responses"
+
+# Weak values: a key's lock lives only while some caller holds it, so the map
+# doesn't grow by one entry per page over a long run.
+_KEY_LOCKS: weakref.WeakValueDictionary[tuple[str, str], threading.Lock] = (
+    weakref.WeakValueDictionary()
+)
+_KEY_LOCKS_GUARD = threading.Lock()
+
+
+def make_cache_key(*parts: str | bytes) -> str:
+    """Hash the inputs that determine a response (image bytes, model, prompt text, ...)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") don't collide.
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def load_cached_response(namespace: str, key: str) -> object | None:
+    """Return the cached JSON value for key, or None on a miss."""
+    path = CACHE_DIR / namespace / f"{key}.json"
+    try:
+        with path.open(encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.warning("Ignoring unreadable %s cache entry %s: %s", namespace, key, exc)
+        return None
+
+
+def save_cached_response(namespace: str, key: str, value: object) -> None:
+    """Store a JSON-serializable value for key."""
+    path = CACHE_DIR / namespace / f"{key}.json"
+    atomic_write_text(path, json.dumps(value, ensure_ascii=False))
+
+
+def response_lock(namespace: str, key: str) -> threading.Lock:
+    """Return the lock serializing work on one cache key.
+
+    Holding it across lookup, LLM call, and save makes concurrent requests for the
+    same content (e.g. byte-identical pages of one document) wait for the first
+    result instead of paying for a duplicate call. The waiter reuses the result
+    through the cache, so there is no deduplication when caching is disabled.
+    """
+    with _KEY_LOCKS_GUARD:
+        lock = _KEY_LOCKS.get((namespace, key))
+        if lock is None:
+            lock = threading.Lock()
+            _KEY_LOCKS[(namespace, key)] = lock
+        return lock
@@ -6,44 +6,53 @@ import logging
 import re
 import tempfile
 from argparse import Namespace
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 from pathlib import Path
+from typing import Callable
 
 import httpx
 from openai import APIError, OpenAI
 from PIL import Image  # type: ignore[import-untyped]
 from tqdm import tqdm  # type: ignore[import-untyped]
 
-from .config import ExtractionConfig, ProfileConfig
+from .config import DEFAULT_INPUT_FILE_REGEX, ExtractionConfig, ProfileConfig
 from .document_io import (
+    cached_image_page_count,
     collect_output_assertions,
-    convert_pdf_to_images,
     copy_source_pdf,
     count_pdf_pages,
+    done_marker_is_current,
     extract_pdf_page_text,
     get_document_output_issue,
+    image_manifest_path,
+    iter_pdf_files,
+    page_image_files,
+    pdf_copy_is_current,
     persist_temp_images,
     preprocess_pdf_images_to_temp,
     purge_derived_outputs,
     remove_skip_marker,
     save_document_summary,
     save_transcription_file,
+    write_done_marker,
+    write_image_manifest,
     write_skip_marker,
 )
 from .extraction import (
     build_chart_user_prompt,
     classify_document,
     score_transcription_confidence,
-    self_consistency,
-    transcribe_page,
+    select_consistent_result,
+    transcribe_page_candidates,
     transcribe_with_retry,
 )
 from .models import ExamRecord
 from .regeneration import regenerate_summaries
 from .standardization import standardize_exam_types
 from .summarization import summarize_document
-from .utils import extract_dates_from_text, setup_logging
+from .utils import RequestRateLimiter, extract_dates_from_text, setup_logging
 from .validation import (
     build_no_readable_text_marker,
     build_non_discrete_chart_marker,
@@ -56,6 +65,13 @@ from .validation import (
 
 logger = logging.getLogger(__name__)
 
+# Progress bars redraw at most twice a second on large corpora.
+TQDM_MIN_INTERVAL = 0.5
+# The OpenAI SDK retries 408/409/429/5xx and connection errors with exponential
+# backoff and jitter (honoring Retry-After); its default of 2 is too few when many
+# workers share one OpenRouter rate limit.
+LLM_MAX_RETRIES = 5
+
 
 class RunMode(str, Enum):
     PROCESS = "process"
@@ -82,7 +98,6 @@ def discover_pdf_files(
     input_path: Path, input_file_regex: str, document: str | None = None
 ) -> list[Path]:
     """Discover candidate PDFs, preferring a direct requested path when present."""
-    pdf_pattern = re.compile(input_file_regex)
     if document:
         direct_candidates = [input_path / document]
         if not document.lower().endswith(".pdf"):
@@ -99,13 +114,12 @@ def discover_pdf_files(
             "Grant the running app read access to that Google Drive folder and try again."
         ) from exc
 
-    return sorted(
-        [
-            pdf_path
-            for pdf_path in input_path.glob("**/*.pdf")
-            if pdf_pattern.match(pdf_path.name)
-        ]
-    )
+    pdf_files = iter_pdf_files(input_path)
+    # iter_pdf_files already filters on the .pdf suffix, which is all the default pattern checks.
+    if input_file_regex == DEFAULT_INPUT_FILE_REGEX:
+        return sorted(pdf_files)
+    pdf_pattern = re.compile(input_file_regex)
+    return sorted(pdf_path for pdf_path in pdf_files if pdf_pattern.match(pdf_path.name))
 
 
 def match_requested_document(pdf_files: list[Path], document: str) -> list[Path]:
@@ -177,11 +191,18 @@ def select_documents_to_process(
         ], already_processed
 
     to_process: list[Path] = []
-    for pdf_path in tqdm(pdf_files, desc="Scanning PDFs", unit="pdf"):
+    for pdf_path in tqdm(
+        pdf_files, desc="Scanning PDFs", unit="pdf", mininterval=TQDM_MIN_INTERVAL
+    ):
         if not _source_pdf_is_available(pdf_path):
             continue
         try:
-            output_issue = get_document_output_issue(pdf_path, output_path)
+            # A current .done marker means the bundle was validated when it was written;
+            # post-run validation and --audit-outputs still check every file.
+            if done_marker_is_current(output_path / pdf_path.stem, pdf_path):
+                output_issue = None
+            else:
+                output_issue = get_document_output_issue(pdf_path, output_path)
         except FileNotFoundError:
             logger.warning("Skipping source PDF that disappeared while scanning: %s", pdf_path)
             continue
@@ -224,36 +245,66 @@ def build_profile_context(profile: ProfileConfig) -> str:
     return "PATIENT CONTEXT:\n" + "\n".join(parts)
 
 
+_VISIBLE_CHART_LABELS = (
+    "Arousal",
+    "U",
+    "W",
+    "R",
+    "N1",
+    "N2",
+    "N3",
+    "Supine",
+    "Left",
+    "Prone",
+    "Right",
+    "Upright",
+    "PLM",
+    "Desat",
+    "SpO2",
+    "Heart Rate",
+    "Snore",
+    "RMI",
+    "Central",
+    "Apnea",
+    "Obstructive",
+    "Hypopnea",
+    "Autonomic",
+)
+
+# Text that means the OCR picked up a different document (ECG/echo report) rather
+# than EEG trace labels.
+_SIGNAL_SUSPICIOUS_PATTERN = re.compile(
+    r"\bPatient\s*:"
+    r"|\bComputer analysis\b"
+    r"|\bECG:\s*12\s*Lead\b"
+    r"|\bRhythm\s*:"
+    r"|\bInterpretation\s*:"
+    r"|\bEcho\s*:"
+    r"|\bCat\s*:",
+    re.IGNORECASE,
+)
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+_EEG_CHANNEL_PATTERN = re.compile(
+    r"\b(?:FP1|FP2|F7|F8|F3|F4|FZ|CZ|PZ|T3|T4|T5|T6|C3|C4|P3|P4|O1|O2|A1|A2)\s*-\s*"
+    r"(?:FP1|FP2|F7|F8|F3|F4|FZ|CZ|PZ|T3|T4|T5|T6|C3|C4|P3|P4|O1|O2|A1|A2)\b",
+    re.IGNORECASE,
+)
+_EEG_KEYWORD_PATTERN = re.compile(
+    r"Post\s+HV\s+\d+\s+Sec"
+    r"|Gain:\s*[\d.]+\s*uV/mm"
+    r"|LFF:\s*[\d.]+\s*Hz"
+    r"|HFF:\s*[\d.]+\s*Hz"
+    r"|Notch:\s*[\d.]+\s*Hz"
+    r"|Page:\s*\d+",
+    re.IGNORECASE,
+)
+_WORD_PATTERN = re.compile(r"\w+")
+_LONG_WORD_PATTERN = re.compile(r"[a-zà-ÿ]{4,}")
+
+
 def _extract_visible_chart_labels(text: str) -> list[str]:
-    labels = []
-    for label in [
-        "Arousal",
-        "U",
-        "W",
-        "R",
-        "N1",
-        "N2",
-        "N3",
-        "Supine",
-        "Left",
-        "Prone",
-        "Right",
-        "Upright",
-        "PLM",
-        "Desat",
-        "SpO2",
-        "Heart Rate",
-        "Snore",
-        "RMI",
-        "Central",
-        "Apnea",
-        "Obstructive",
-        "Hypopnea",
-        "Autonomic",
-    ]:
-        if label.lower() in text.lower():
-            labels.append(label)
-    return labels
+    lowered = text.lower()
+    return [label for label in _VISIBLE_CHART_LABELS if label.lower() in lowered]
 
 
 def _extract_visible_signal_labels(
@@ -264,43 +315,17 @@ def _extract_visible_signal_labels(
     if not body:
         return []
 
-    suspicious_patterns = [
-        r"\bPatient\s*:",
-        r"\bComputer analysis\b",
-        r"\bECG:\s*12\s*Lead\b",
-        r"\bRhythm\s*:",
-        r"\bInterpretation\s*:",
-        r"\bEcho\s*:",
-        r"\bCat\s*:",
-    ]
-    if any(re.search(pattern, body, re.IGNORECASE) for pattern in suspicious_patterns):
+    if _SIGNAL_SUSPICIOUS_PATTERN.search(body):
         return []
 
     if document_date:
         doc_year = document_date[:4]
-        years = re.findall(r"\b(?:19|20)\d{2}\b", body)
-        if any(year != doc_year for year in years):
+        if any(year != doc_year for year in _YEAR_PATTERN.findall(body)):
             return []
 
     labels: set[str] = set()
-    channel_pattern = re.compile(
-        r"\b(?:FP1|FP2|F7|F8|F3|F4|FZ|CZ|PZ|T3|T4|T5|T6|C3|C4|P3|P4|O1|O2|A1|A2)\s*-\s*"
-        r"(?:FP1|FP2|F7|F8|F3|F4|FZ|CZ|PZ|T3|T4|T5|T6|C3|C4|P3|P4|O1|O2|A1|A2)\b",
-        re.IGNORECASE,
-    )
-    labels.update(match.group(0).upper() for match in channel_pattern.finditer(body))
-
-    keyword_patterns = [
-        r"Post\s+HV\s+\d+\s+Sec",
-        r"Gain:\s*[\d.]+\s*uV/mm",
-        r"LFF:\s*[\d.]+\s*Hz",
-        r"HFF:\s*[\d.]+\s*Hz",
-        r"Notch:\s*[\d.]+\s*Hz",
-        r"Page:\s*\d+",
-    ]
-    for pattern in keyword_patterns:
-        for match in re.finditer(pattern, body, re.IGNORECASE):
-            labels.add(match.group(0))
+    labels.update(match.group(0).upper() for match in _EEG_CHANNEL_PATTERN.finditer(body))
+    labels.update(match.group(0) for match in _EEG_KEYWORD_PATTERN.finditer(body))
 
     return sorted(labels)
 
@@ -311,6 +336,8 @@ def _transcribe_rotated_image(
     client: OpenAI,
     validation_model_id: str,
     profile_context: str,
+    max_tokens: int,
+    use_cache: bool = False,
 ) -> tuple[str, str, int]:
     """Rotate image 180 degrees and run the standard transcription retry flow."""
     with tempfile.NamedTemporaryFile(suffix=".jpg") as tmp_file:
@@ -326,6 +353,8 @@ def _transcribe_rotated_image(
             profile_context=profile_context,
             max_retries=1,
             page_kind="text",
+            max_tokens=max_tokens,
+            use_cache=use_cache,
         )
 
 
@@ -353,7 +382,7 @@ def _should_mark_unsupported_visual(
         return True
 
     lowered = body.lower()
-    words = re.findall(r"\w+", lowered)
+    words = _WORD_PATTERN.findall(lowered)
     if lowered == build_no_readable_text_marker().lower():
         return True
     if body.count("[illegible]") >= 2 and len(words) <= 25:
@@ -361,27 +390,33 @@ def _should_mark_unsupported_visual(
     if (
         len(body) < 120
         and body.count("\n") >= 3
-        and len(re.findall(r"[a-zà-ÿ]{4,}", lowered)) < 8
+        and len(_LONG_WORD_PATTERN.findall(lowered)) < 8
     ):
         return True
     return False
 
 
-def extract_date_from_filename(filename: str) -> str | None:
-    """Try to extract date from filename in YYYY-MM-DD format."""
-    match = re.search(r"(\d{4}-\d{2}-\d{2})", filename)
-    if match:
-        return match.group(1)
+# One zero-width alternation per position finds every candidate in a single pass;
+# ISO dates win, then YYYY_MM_DD, then YYYYMMDD, leftmost within each kind.
+_FILENAME_DATE_PATTERN = re.compile(
+    r"(?=(?P<iso>\d{4}-\d{2}-\d{2})|(?P<underscore>\d{4}_\d{2}_\d{2})|(?P<compact>\d{8}))"
+)
 
-    match = re.search(r"(\d{4})_(\d{2})_(\d{2})", filename)
-    if match:
-        return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
 
-    match = re.search(r"(\d{4})(\d{2})(\d{2})", filename)
-    if match:
-        return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
+def extract_date_from_filename(filename: str) -> str | None:
+    """Try to extract date from filename in YYYY-MM-DD format."""
+    underscore_date = None
+    compact_date = None
+    for match in _FILENAME_DATE_PATTERN.finditer(filename):
+        if match.group("iso"):
+            return match.group("iso")
+        if underscore_date is None and match.group("underscore"):
+            underscore_date = match.group("underscore").replace("_", "-")
+        elif compact_date is None and match.group("compact"):
+            digits = match.group("compact")
+            compact_date = f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
 
-    return None
+    return underscore_date or compact_date
 
 
 def select_most_frequent_date(
@@ -390,27 +425,20 @@ def select_most_frequent_date(
     filename_date: str | None = None,
 ) -> str | None:
     """Select the most frequent exam date across all pages using frequency-based voting."""
-    from collections import Counter
-
-    all_dates = []
     excluded_dates = exclude_dates or set()
-    for exam in exams:
-        if exam.transcription:
-            page_dates = [
-                date
-                for date in extract_dates_from_text(exam.transcription)
-                if date not in excluded_dates
-            ]
-            if page_dates:
-                all_dates.extend(page_dates)
-
-    if not all_dates:
-        all_dates = [exam.exam_date for exam in exams if exam.exam_date]
-
-    if not all_dates:
+    date_counts = Counter(
+        date
+        for exam in exams
+        if exam.transcription
+        for date in extract_dates_from_text(exam.transcription)
+        if date not in excluded_dates
+    )
+    if not date_counts:
+        date_counts = Counter(exam.exam_date for exam in exams if exam.exam_date)
+
+    if not date_counts:
         return None
 
-    date_counts = Counter(all_dates)
     most_common_date, count = date_counts.most_common(1)[0]
 
     if len(date_counts) > 1:
@@ -419,7 +447,7 @@ def select_most_frequent_date(
             "Selected most frequent date: %s (%s/%s pages)",
             most_common_date,
             count,
-            len(all_dates),
+            sum(date_counts.values()),
         )
 
     if (
@@ -440,6 +468,17 @@ def select_most_frequent_date(
     return most_common_date
 
 
+def select_classification_pages(image_paths: list[Path], max_pages: int) -> list[Path]:
+    """Pick up to max_pages evenly spaced pages, keeping the first and last."""
+    if len(image_paths) <= max_pages:
+        return image_paths
+    if max_pages == 1:
+        return image_paths[:1]
+    last_index = len(image_paths) - 1
+    indices = sorted({round(step * last_index / (max_pages - 1)) for step in range(max_pages)})
+    return [image_paths[index] for index in indices]
+
+
 def process_single_pdf(
     pdf_path: Path,
     output_path: Path,
@@ -451,27 +490,24 @@ def process_single_pdf(
 ) -> int | None | str:
     """Process a single PDF and return page count, None on failure, or 'skipped'."""
     doc_stem = pdf_path.stem
-    logger.info("Processing: %s", pdf_path.name)
+    logger.debug("Processing: %s", pdf_path.name)
     doc_output_dir = output_path / doc_stem
     working_pdf_path = pdf_path
     existing_output_pdf = doc_output_dir / pdf_path.name
-    if existing_output_pdf.exists():
+    output_pdf_is_current = pdf_copy_is_current(pdf_path, existing_output_pdf)
+    if output_pdf_is_current:
         working_pdf_path = existing_output_pdf
 
     if config.dry_run:
         try:
-            page_count = len(convert_pdf_to_images(working_pdf_path))
+            page_count = count_pdf_pages(working_pdf_path)
         except Exception as exc:
             logger.error("Failed to count pages in PDF: %s: %s", pdf_path.name, exc)
             return None
         logger.info("[DRY RUN] Would process %s pages: %s", page_count, pdf_path.name)
         return page_count
 
-    existing_images = (
-        sorted(doc_output_dir.glob(f"{doc_stem}.*.jpg"))
-        if doc_output_dir.exists()
-        else []
-    )
+    existing_images = sorted(page_image_files(doc_output_dir, doc_stem))
 
     if force_regenerate_images and existing_images:
         logger.info("Force regenerating %s images", len(existing_images))
@@ -479,9 +515,22 @@ def process_single_pdf(
             img_path.unlink()
         existing_images = []
 
+    manifest_page_count = None
+    if existing_images:
+        manifest_page_count = cached_image_page_count(doc_output_dir, pdf_path)
+        if manifest_page_count is None and image_manifest_path(doc_output_dir).exists():
+            logger.info(
+                "Discarding %s existing images for %s (source PDF changed)",
+                len(existing_images),
+                pdf_path.name,
+            )
+            for img_path in existing_images:
+                img_path.unlink()
+            existing_images = []
+
     if existing_images:
         try:
-            expected_page_count = count_pdf_pages(working_pdf_path)
+            expected_page_count = manifest_page_count or count_pdf_pages(working_pdf_path)
         except Exception as exc:
             logger.warning(
                 "Could not validate existing images for %s: %s",
@@ -506,6 +555,10 @@ def process_single_pdf(
                 for img_path in existing_images:
                     img_path.unlink()
                 existing_images = []
+            elif manifest_page_count is None:
+                # Legacy images without a manifest: record the source PDF they now match,
+                # so a later edit that keeps the page count is still detected.
+                write_image_manifest(doc_output_dir, pdf_path, expected_page_count)
 
     temp_dir = None
     try:
@@ -526,10 +579,11 @@ def process_single_pdf(
         )
         try:
             classification = classify_document(
-                temp_image_paths,
+                select_classification_pages(temp_image_paths, config.classify_max_pages),
                 config.extract_model_id,
                 client,
                 profile_context=profile_context,
+                use_cache=config.use_cache,
             )
         except (APIError, RuntimeError, ValueError, TypeError) as exc:
             logger.error("Classification failed for %s: %s", pdf_path.name, exc)
@@ -542,7 +596,7 @@ def process_single_pdf(
                 doc_stem,
                 remove_images=True,
             )
-            copy_source_pdf(pdf_path, doc_output_dir)
+            copy_source_pdf(pdf_path, doc_output_dir, copy_is_current=output_pdf_is_current)
             write_skip_marker(
                 doc_output_dir,
                 pdf_path.name,
@@ -560,8 +614,12 @@ def process_single_pdf(
         )
         remove_skip_marker(doc_output_dir)
 
-        copy_source_pdf(pdf_path, doc_output_dir)
-        image_paths = existing_images or persist_temp_images(temp_image_paths, doc_output_dir)
+        copy_source_pdf(pdf_path, doc_output_dir, copy_is_current=output_pdf_is_current)
+        if existing_images:
+            image_paths = existing_images
+        else:
+            image_paths = persist_temp_images(temp_image_paths, doc_output_dir)
+            write_image_manifest(doc_output_dir, pdf_path, len(image_paths))
 
         exam_name = classification.exam_name_raw or doc_stem
         exam_date = classification.exam_date or extract_date_from_filename(pdf_path.name)
@@ -594,6 +652,8 @@ def process_single_pdf(
                     temperature=0.1,
                     profile_context=profile_context,
                     max_retries=1,
+                    max_tokens=config.max_completion_tokens,
+                    use_cache=config.use_cache,
                     page_kind="text",
                 )
                 signal_labels = _extract_visible_signal_labels(
@@ -613,6 +673,8 @@ def process_single_pdf(
                         client=client,
                         validation_model_id=config.validation_model_id,
                         profile_context=profile_context,
+                        max_tokens=config.max_completion_tokens,
+                        use_cache=config.use_cache,
                     )
                     retry_attempts += rotated_attempts
                     signal_labels = _extract_visible_signal_labels(
@@ -639,6 +701,8 @@ def process_single_pdf(
                     temperature=0.1,
                     profile_context=profile_context,
                     max_retries=1,
+                    max_tokens=config.max_completion_tokens,
+                    use_cache=config.use_cache,
                     page_kind="chart",
                     chart_type=chart_type,
                     prompt_variants=[
@@ -657,6 +721,8 @@ def process_single_pdf(
                     temperature=0.1,
                     profile_context=profile_context,
                     max_retries=1,
+                    max_tokens=config.max_completion_tokens,
+                    use_cache=config.use_cache,
                     page_kind="chart",
                     chart_type=chart_type,
                     prompt_variants=[
@@ -670,15 +736,20 @@ def process_single_pdf(
                 transcription = embedded_text
                 prompt_variant_used = "pdftotext_layout"
             elif config.n_extractions > 1:
-                transcription, all_transcriptions = self_consistency(
-                    transcribe_page,
-                    config.self_consistency_model_id,
-                    config.n_extractions,
+                all_transcriptions = transcribe_page_candidates(
                     image_path,
                     config.extract_model_id,
                     client,
-                    client=client,
+                    config.n_extractions,
                     profile_context=profile_context,
+                    max_tokens=config.max_completion_tokens,
+                    use_cache=config.use_cache,
+                )
+                transcription, all_transcriptions = select_consistent_result(
+                    all_transcriptions,
+                    config.self_consistency_model_id,
+                    "transcribe_page",
+                    client=client,
                 )
                 confidence = score_transcription_confidence(
                     transcription,
@@ -701,6 +772,8 @@ def process_single_pdf(
                     temperature=0.1,
                     profile_context=profile_context,
                     max_retries=3,
+                    max_tokens=config.max_completion_tokens,
+                    use_cache=config.use_cache,
                     page_kind="text",
                 )
 
@@ -812,11 +885,12 @@ def process_single_pdf(
             "audiogram": ("other", "Speech Audiogram"),
             "tympanometry": ("other", "Tympanometry"),
         }
-        raw_names = list(
+        # Sorted so the standardization prompt is byte-stable across runs.
+        raw_names = sorted(
             {
                 exam.exam_name_raw
                 for exam in all_exams
-                if exam.chart_type not in deterministic_mappings
+                if exam.exam_name_raw and exam.chart_type not in deterministic_mappings
             }
         )
         try:
@@ -851,6 +925,7 @@ def process_single_pdf(
                 config.summarize_model_id,
                 client,
                 max_input_tokens=config.summarize_max_input_tokens,
+                use_cache=config.use_cache,
             )
         except (APIError, RuntimeError, ValueError, TypeError) as exc:
             logger.error("Summarization failed for %s: %s", pdf_path.name, exc)
@@ -860,6 +935,8 @@ def process_single_pdf(
             logger.error("Blocking summary validation failure in %s", pdf_path.name)
             return None
         save_document_summary(document_summary, doc_output_dir, doc_stem, all_exams)
+        if get_document_output_issue(pdf_path, output_path) is None:
+            write_done_marker(doc_output_dir, pdf_path)
 
     logger.info("Processed %s pages for: %s", len(all_exams), pdf_path.name)
     return len(all_exams)
@@ -907,6 +984,25 @@ def print_run_summary(
         print(f"Failed: {failed_count}")
 
 
+def build_http_limits(config: ExtractionConfig) -> httpx.Limits:
+    """Size the shared connection pool so every concurrent LLM call can keep a connection alive."""
+    in_flight = config.document_workers * config.max_workers * max(config.n_extractions, 1)
+    # Never go below the httpx defaults (100 connections, 20 kept alive).
+    return httpx.Limits(
+        max_connections=max(100, in_flight * 2),
+        max_keepalive_connections=max(20, in_flight),
+    )
+
+
+def build_http_client(config: ExtractionConfig) -> httpx.Client:
+    """Build the shared HTTP client, pacing every request (retries included) when limited."""
+    event_hooks: dict[str, list[Callable[[httpx.Request], None]]] = {}
+    if config.requests_per_minute:
+        limiter = RequestRateLimiter(config.requests_per_minute)
+        event_hooks["request"] = [lambda _request: limiter.acquire()]
+    return httpx.Client(limits=build_http_limits(config), event_hooks=event_hooks)
+
+
 def run_profile(profile_name: str, args: Namespace) -> bool:
     """Run the pipeline for a single profile."""
     profile_path = ProfileConfig.find_profile(profile_name)
@@ -933,6 +1029,12 @@ def run_profile(profile_name: str, args: Namespace) -> bool:
         config.summarize_model_id = args.model
     if args.workers:
         config.max_workers = args.workers
+    if args.document_workers:
+        config.document_workers = args.document_workers
+    if args.requests_per_minute:
+        config.requests_per_minute = args.requests_per_minute
+    if args.no_cache:
+        config.use_cache = False
     if args.pattern:
         config.input_file_regex = args.pattern
     config.dry_run = resolve_run_mode(args) == RunMode.DRY_RUN
@@ -962,7 +1064,8 @@ def run_profile(profile_name: str, args: Namespace) -> bool:
     client = OpenAI(
         base_url=config.openrouter_base_url,
         api_key=config.openrouter_api_key,
-        http_client=httpx.Client(),
+        http_client=build_http_client(config),
+        max_retries=LLM_MAX_RETRIES,
     )
 
     profile_context = build_profile_context(profile)
@@ -1058,9 +1161,9 @@ def run_profile(profile_name: str, args: Namespace) -> bool:
     processed_documents: list[Path] = []
     failed_count = 0
 
-    for pdf_path in tqdm(to_process, desc="Processing PDFs"):
+    def process_document(pdf_path: Path) -> int | str | None:
         try:
-            result = process_single_pdf(
+            return process_single_pdf(
                 pdf_path,
                 config.output_path,
                 config,
@@ -1071,9 +1174,27 @@ def run_profile(profile_name: str, args: Namespace) -> bool:
             )
         except Exception:
             logger.exception("Failed to process %s", pdf_path.name)
-            failed_count += 1
-            continue
+            return None
 
+    # Documents are independent; each one still fans its pages out over max_workers.
+    with ThreadPoolExecutor(max_workers=config.document_workers) as executor:
+        futures = [executor.submit(process_document, pdf_path) for pdf_path in to_process]
+        try:
+            for _ in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc="Processing PDFs",
+                mininterval=TQDM_MIN_INTERVAL,
+            ):
+                pass
+        except BaseException:
+            # On Ctrl-C or an error, finish the documents already running but don't
+            # start (and pay for) the queued ones.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    for pdf_path, future in zip(to_process, futures):
+        result = future.result()
         if result == "skipped":
             skipped_documents.append(pdf_path.name)
         elif isinstance(result, int):
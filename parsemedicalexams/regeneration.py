@@ -3,15 +3,21 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from .document_io import (
     copy_source_pdf,
+    done_marker_path,
     frontmatter_to_exam,
+    get_document_output_issue,
+    iter_pdf_files,
+    page_image_files,
     parse_frontmatter,
     save_document_summary,
     transcription_files,
+    write_done_marker,
 )
 from .models import ExamRecord
 from .summarization import summarize_document
@@ -53,11 +59,17 @@ def regenerate_summaries(
 
     logger.info("Found %s document directories to regenerate", len(doc_dirs))
 
-    total_exams = 0
-    for doc_dir in doc_dirs:
+    # Index source PDFs once instead of walking input_path for every document.
+    source_pdfs_by_stem: dict[str, Path] = {}
+    if input_path and doc_dirs:
+        for pdf_path in sorted(iter_pdf_files(input_path)):
+            source_pdfs_by_stem.setdefault(pdf_path.stem, pdf_path)
+
+    def regenerate_document(doc_dir: Path) -> int:
+        """Rebuild one document's summary, returning its exam count (0 when skipped)."""
         doc_stem = doc_dir.name
 
-        jpg_files = list(doc_dir.glob(f"{doc_stem}.*.jpg"))
+        jpg_files = page_image_files(doc_dir, doc_stem)
         md_transcription_files = transcription_files(doc_dir, doc_stem)
         if jpg_files and len(jpg_files) != len(md_transcription_files):
             logger.error(
@@ -66,17 +78,16 @@ def regenerate_summaries(
                 len(jpg_files),
                 len(md_transcription_files),
             )
-            continue
+            return 0
 
-        if input_path:
-            source_pdfs = list(input_path.glob(f"**/{doc_stem}.pdf"))
-            if source_pdfs:
-                copy_source_pdf(source_pdfs[0], doc_dir)
+        source_pdf = source_pdfs_by_stem.get(doc_stem)
+        if source_pdf:
+            copy_source_pdf(source_pdf, doc_dir)
 
-        md_files = sorted(transcription_files(doc_dir, doc_stem))
+        md_files = sorted(md_transcription_files)
         if not md_files:
             logger.warning("No transcription files found in %s", doc_dir)
-            continue
+            return 0
 
         all_exams: list[ExamRecord] = []
         for md_path in md_files:
@@ -102,10 +113,11 @@ def regenerate_summaries(
 
         if not all_exams:
             logger.warning("No exams found in %s", doc_dir)
-            continue
+            return 0
 
         for old_summary in doc_dir.glob("*.summary.md"):
             old_summary.unlink()
+        done_marker_path(doc_dir).unlink(missing_ok=True)
 
         document_summary = summarize_document(
             all_exams,
@@ -115,10 +127,21 @@ def regenerate_summaries(
         )
         if first_blocking_issue(validate_summary_output(document_summary)):
             logger.error("Summary validation failed for %s", doc_stem)
-            continue
+            return 0
 
         save_document_summary(document_summary, doc_dir, doc_stem, all_exams)
+        if source_pdf and get_document_output_issue(source_pdf, output_path) is None:
+            write_done_marker(doc_dir, source_pdf)
         logger.info("Regenerated summary for %s exams: %s", len(all_exams), doc_stem)
-        total_exams += len(all_exams)
-
-    return total_exams
+        return len(all_exams)
+
+    # Documents are independent, so their summary calls run concurrently like
+    # document processing does.
+    with ThreadPoolExecutor(max_workers=config.document_workers) as executor:
+        futures = [executor.submit(regenerate_document, doc_dir) for doc_dir in doc_dirs]
+        try:
+            return sum(future.result() for future in futures)
+        except BaseException:
+            # Don't start the queued summary calls after Ctrl-C or a failure.
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
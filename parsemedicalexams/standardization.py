@@ -2,17 +2,29 @@
 
 import json
 import logging
+import threading
+from pathlib import Path
 
 from openai import OpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
 from .config import get_cache_dir
 from .models import ALLOWED_CATEGORIES, ExamCategory, StandardizedExamEntry
-from .utils import load_prompt, parse_json_mapping, require_completion_text
+from .utils import (
+    atomic_write_text,
+    load_prompt,
+    parse_json_mapping,
+    require_completion_text,
+    system_message,
+)
 
 logger = logging.getLogger(__name__)
 
 CACHE_DIR = get_cache_dir()
+# Documents may be standardized concurrently; serialize cache reads and writes.
+_CACHE_LOCK = threading.Lock()
+# Parsed cache files with the (mtime_ns, size) they were read at.
+_LOADED_CACHES: dict[Path, tuple[tuple[int, int], dict[str, StandardizedExamEntry]]] = {}
 
 
 def _validated_exam_type(exam_type: object, raw_name: str) -> ExamCategory:
@@ -21,39 +33,59 @@ def _validated_exam_type(exam_type: object, raw_name: str) -> ExamCategory:
     raise ValueError(f"Invalid exam_type for '{raw_name}': {exam_type!r}")
 
 
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def load_cache(name: str) -> dict[str, StandardizedExamEntry]:
     """Load JSON cache file. User-editable for overriding LLM decisions."""
     path = CACHE_DIR / f"{name}.json"
-    if path.exists():
-        try:
-            with path.open(encoding="utf-8") as handle:
-                raw_cache = json.load(handle)
-        except (json.JSONDecodeError, OSError) as exc:
-            logger.warning("Failed to load cache %s: %s", name, exc)
-            return {}
-
-        if isinstance(raw_cache, dict):
-            cache: dict[str, StandardizedExamEntry] = {}
-            for key, value in raw_cache.items():
-                if not isinstance(key, str) or not isinstance(value, dict):
-                    continue
-                exam_type = value.get("exam_type")
-                standardized_name = value.get("standardized_name")
-                if isinstance(exam_type, str) and isinstance(standardized_name, str):
-                    cache[key] = {
-                        "exam_type": _validated_exam_type(exam_type, key),
-                        "standardized_name": standardized_name,
-                    }
-            return cache
-    return {}
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return {}
+    # Reuse the parsed file until it changes on disk (e.g. a manual edit).
+    loaded = _LOADED_CACHES.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return dict(loaded[1])
+
+    try:
+        with path.open(encoding="utf-8") as handle:
+            raw_cache = json.load(handle)
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.warning("Failed to load cache %s: %s", name, exc)
+        return {}
+
+    cache: dict[str, StandardizedExamEntry] = {}
+    if isinstance(raw_cache, dict):
+        for key, value in raw_cache.items():
+            if not isinstance(key, str) or not isinstance(value, dict):
+                continue
+            exam_type = value.get("exam_type")
+            standardized_name = value.get("standardized_name")
+            if isinstance(exam_type, str) and isinstance(standardized_name, str):
+                cache[key] = {
+                    "exam_type": _validated_exam_type(exam_type, key),
+                    "standardized_name": standardized_name,
+                }
+    _LOADED_CACHES[path] = (stamp, cache)
+    return dict(cache)
 
 
 def save_cache(name: str, cache: dict[str, StandardizedExamEntry]) -> None:
     """Save cache to JSON, sorted alphabetically for easy editing."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
     path = CACHE_DIR / f"{name}.json"
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(cache, handle, indent=2, ensure_ascii=False, sort_keys=True)
+    # Written atomically so an interrupted run can't truncate the shared cache.
+    atomic_write_text(
+        path,
+        json.dumps(cache, indent=2, ensure_ascii=False, sort_keys=True),
+    )
+    stamp = _file_stamp(path)
+    if stamp is not None:
+        _LOADED_CACHES[path] = (stamp, dict(cache))
 
 
 def _default_entry(raw_name: str) -> StandardizedExamEntry:
@@ -81,9 +113,15 @@ def standardize_exam_types(
     if not raw_exam_names:
         return {}
 
-    cache = load_cache("exam_type_standardization")
-    unique_raw_names = list(set(raw_exam_names))
-    uncached_names = [name for name in unique_raw_names if _cache_key(name) not in cache]
+    with _CACHE_LOCK:
+        cache = load_cache("exam_type_standardization")
+    key_by_name = {name: _cache_key(name) for name in raw_exam_names}
+    # One name per cache key: case/whitespace variants share a single LLM mapping.
+    names_by_key: dict[str, str] = {}
+    for name in sorted(key_by_name):
+        if key_by_name[name]:
+            names_by_key.setdefault(key_by_name[name], name)
+    uncached_names = [name for key, name in names_by_key.items() if key not in cache]
     if uncached_names:
         logger.info(
             "[exam_type_standardization] %s uncached names, calling LLM...",
@@ -96,7 +134,7 @@ def standardize_exam_types(
             exam_names=json.dumps(uncached_names, ensure_ascii=False, indent=2)
         )
         messages: list[ChatCompletionMessageParam] = [
-            {"role": "system", "content": system_prompt},
+            system_message(system_prompt, model_id),
             {"role": "user", "content": user_prompt},
         ]
         completion = client.chat.completions.create(
@@ -108,6 +146,7 @@ def standardize_exam_types(
         response_text = require_completion_text(completion, "exam standardization")
         llm_result = parse_json_mapping(response_text, "exam standardization")
 
+        new_entries: dict[str, StandardizedExamEntry] = {}
         for raw_name in uncached_names:
             raw_entry = llm_result.get(raw_name)
             if not isinstance(raw_entry, dict):
@@ -117,20 +156,24 @@ def standardize_exam_types(
             if not isinstance(standardized_name, str):
                 raise ValueError(f"Invalid standardization mapping for '{raw_name}'")
             validated_exam_type = _validated_exam_type(exam_type, raw_name)
-            cache[_cache_key(raw_name)] = {
+            new_entries[key_by_name[raw_name]] = {
                 "exam_type": validated_exam_type,
                 "standardized_name": standardized_name,
             }
 
-        save_cache("exam_type_standardization", cache)
+        # Reload before saving so entries written by concurrent documents are kept.
+        with _CACHE_LOCK:
+            cache = load_cache("exam_type_standardization")
+            cache.update(new_entries)
+            save_cache("exam_type_standardization", cache)
         logger.info(
             "[exam_type_standardization] Cache updated with %s entries",
             len(uncached_names),
         )
 
     result: dict[str, tuple[str, str]] = {}
-    for name in raw_exam_names:
-        cached = cache.get(_cache_key(name), _default_entry(name))
+    for name, key in key_by_name.items():
+        cached = cache.get(key, _default_entry(name))
         result[name] = (cached["exam_type"], cached["standardized_name"])
 
     return result
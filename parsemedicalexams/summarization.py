@@ -3,17 +3,20 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from openai import OpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
+from .llm_cache import load_cached_response, make_cache_key, save_cached_response
 from .models import ExamRecord
-from .utils import load_prompt, require_completion_text
+from .utils import load_prompt, require_completion_text, system_message
 from .validation import first_blocking_issue, validate_summary_output
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_INPUT_TOKENS = 100_000
+SUMMARY_MAP_WORKERS = 4
 
 
 def _estimate_tokens(text: str) -> int:
@@ -66,9 +69,11 @@ def summarize_document(
     model_id: str,
     client: OpenAI,
     max_input_tokens: int = DEFAULT_MAX_INPUT_TOKENS,
+    use_cache: bool = False,
 ) -> str:
     """Generate a comprehensive clinical summary for all exams in a document.
-    Uses incremental chunked summarization to fit within token budget."""
+    Long documents are summarized chunk by chunk in parallel and then merged.
+    With use_cache, a validated summary is reused for identical page content and prompts."""
     if not exams:
         return ""
 
@@ -80,6 +85,7 @@ def summarize_document(
     ]
     if not exams_with_content:
         return ""
+    exams_with_content = _drop_duplicate_transcriptions(exams_with_content)
 
     system_prompt = load_prompt("summarization_system")
     user_prompt_template = load_prompt("summarization_user")
@@ -87,10 +93,26 @@ def summarize_document(
     fixed_overhead_tokens = _estimate_tokens(system_prompt) + 200
     content_budget = max_input_tokens - fixed_overhead_tokens
 
+    cache_key = None
+    if use_cache:
+        cache_key = make_cache_key(
+            _build_exam_list(exams_with_content),
+            _build_transcriptions(exams_with_content),
+            model_id,
+            system_prompt,
+            user_prompt_template,
+            load_prompt("summarization_reduce_user"),
+            str(max_input_tokens),
+        )
+        cached = load_cached_response("summaries", cache_key)
+        if isinstance(cached, str):
+            logger.debug("Using cached summary for %s exam(s)", len(exams_with_content))
+            return cached
+
     attempts = 2
-    running_summary = ""
+    summary = ""
     for attempt in range(1, attempts + 1):
-        running_summary = _incremental_summarize(
+        summary = _map_reduce_summarize(
             exams_with_content,
             system_prompt,
             user_prompt_template,
@@ -98,10 +120,12 @@ def summarize_document(
             model_id,
             client,
         )
-        issues = validate_summary_output(running_summary)
+        issues = validate_summary_output(summary)
         blocking_issue = first_blocking_issue(issues)
         if not blocking_issue:
-            return running_summary
+            if cache_key:
+                save_cached_response("summaries", cache_key, summary)
+            return summary
         logger.warning(
             "Summary validation failure on attempt %s/%s: %s",
             attempt,
@@ -112,7 +136,22 @@ def summarize_document(
     raise RuntimeError("Summary validation failed after all summarization attempts")
 
 
-def _incremental_summarize(
+def _drop_duplicate_transcriptions(exams: list[ExamRecord]) -> list[ExamRecord]:
+    """Keep the first of any pages whose transcriptions are identical (e.g. duplicated scans)."""
+    exams_by_text: dict[str, ExamRecord] = {}
+    for exam in exams:
+        exams_by_text.setdefault(exam.transcription.strip(), exam)
+    unique_exams = list(exams_by_text.values())
+    if len(unique_exams) < len(exams):
+        logger.info(
+            "Summarizing %s unique transcription(s), dropped %s duplicate page(s)",
+            len(unique_exams),
+            len(exams) - len(unique_exams),
+        )
+    return unique_exams
+
+
+def _map_reduce_summarize(
     exams: list[ExamRecord],
     system_prompt: str,
     user_prompt_template: str,
@@ -120,54 +159,98 @@ def _incremental_summarize(
     model_id: str,
     client: OpenAI,
 ) -> str:
-    """Summarize exams in chunks, building a running summary incrementally."""
-    incremental_template = load_prompt("summarization_incremental_user")
-
+    """Summarize page-range chunks in parallel, then merge the partial summaries."""
     chunks = _split_into_chunks(exams, content_budget)
-    logger.info(f"Summarizing {len(exams)} exam(s) in {len(chunks)} chunk(s)")
+    logger.info("Summarizing %s exam(s) in %s chunk(s)", len(exams), len(chunks))
 
-    running_summary = ""
+    def summarize_chunk(chunk: list[ExamRecord]) -> str:
+        user_prompt = user_prompt_template.format(
+            exam_count=len(chunk),
+            exam_list=_build_exam_list(chunk),
+            transcriptions=_build_transcriptions(chunk),
+        )
+        return _llm_summarize(
+            [
+                system_message(system_prompt, model_id),
+                {"role": "user", "content": user_prompt},
+            ],
+            model_id,
+            client,
+        )
 
-    for chunk_idx, chunk in enumerate(chunks):
-        exam_list = _build_exam_list(chunk)
-        transcriptions = _build_transcriptions(chunk)
+    if len(chunks) == 1:
+        return summarize_chunk(chunks[0])
 
-        if chunk_idx == 0:
-            user_prompt = user_prompt_template.format(
-                exam_count=len(chunk),
-                exam_list=exam_list,
-                transcriptions=transcriptions,
-            )
-        else:
-            user_prompt = incremental_template.format(
-                existing_summary=running_summary,
-                new_exam_count=len(chunk),
-                new_exam_list=exam_list,
-                new_transcriptions=transcriptions,
-            )
+    with ThreadPoolExecutor(max_workers=min(len(chunks), SUMMARY_MAP_WORKERS)) as executor:
+        partial_summaries = list(executor.map(summarize_chunk, chunks))
 
-        logger.info(
-            "Summarizing chunk %s/%s (%s exams)",
-            chunk_idx + 1,
-            len(chunks),
-            len(chunk),
+    return _reduce_summaries(
+        partial_summaries, exams, system_prompt, content_budget, model_id, client
+    )
+
+
+def _reduce_summaries(
+    partial_summaries: list[str],
+    exams: list[ExamRecord],
+    system_prompt: str,
+    content_budget: int,
+    model_id: str,
+    client: OpenAI,
+) -> str:
+    """Merge partial summaries in order, in several rounds if they exceed the budget."""
+    reduce_template = load_prompt("summarization_reduce_user")
+    exam_list = _build_exam_list(exams)
+    summary_budget = content_budget - _estimate_tokens(exam_list) - 500
+
+    def merge(group: list[str]) -> str:
+        user_prompt = reduce_template.format(
+            exam_count=len(exams),
+            exam_list=exam_list,
+            summary_count=len(group),
+            partial_summaries="\n\n".join(
+                f"--- PARTIAL SUMMARY {index} ---\n{summary.strip()}"
+                for index, summary in enumerate(group, 1)
+            ),
         )
-        running_summary = _llm_summarize(
+        return _llm_summarize(
             [
-                {"role": "system", "content": system_prompt},
+                system_message(system_prompt, model_id),
                 {"role": "user", "content": user_prompt},
             ],
             model_id,
             client,
         )
 
-    return running_summary
+    while len(partial_summaries) > 1:
+        groups: list[list[str]] = []
+        current_group: list[str] = []
+        current_tokens = 0
+        for summary in partial_summaries:
+            summary_tokens = _estimate_tokens(summary)
+            # Always merge at least two summaries per group so every round shrinks.
+            if len(current_group) >= 2 and current_tokens + summary_tokens > summary_budget:
+                groups.append(current_group)
+                current_group = []
+                current_tokens = 0
+            current_group.append(summary)
+            current_tokens += summary_tokens
+        groups.append(current_group)
+
+        logger.info(
+            "Merging %s partial summaries in %s group(s)", len(partial_summaries), len(groups)
+        )
+        with ThreadPoolExecutor(max_workers=min(len(groups), SUMMARY_MAP_WORKERS)) as executor:
+            partial_summaries = list(
+                executor.map(lambda group: merge(group) if len(group) > 1 else group[0], groups)
+            )
+
+    return partial_summaries[0]
 
 
 def _split_into_chunks(exams: list[ExamRecord], content_budget: int) -> list[list[ExamRecord]]:
     """Split exams into chunks that each fit within the token budget."""
-    incremental_overhead = 2000
-    chunk_budget = content_budget - incremental_overhead
+    prompt_overhead = 2000
+    chunk_budget = content_budget - prompt_overhead
 
     chunks: list[list[ExamRecord]] = []
     current_chunk: list[ExamRecord] = []
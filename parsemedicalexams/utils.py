@@ -1,17 +1,34 @@
 """Shared utility functions for the medical exams parser."""
 
+import atexit
 import json
 import logging
+import logging.handlers
+import os
+import queue
 import re
+import tempfile
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import cast
 
+from openai.types.chat import ChatCompletionSystemMessageParam
 from PIL import Image, ImageEnhance  # type: ignore[import-untyped]
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 logger = logging.getLogger(__name__)
 
+_ISO_DATE_PATTERN = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_DAY_FIRST_DATE_PATTERN = re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b")
 
+# Writes log records to the log files on a background thread (see setup_logging).
+_file_log_listener: logging.handlers.QueueListener | None = None
+
+
+# Prompts are read on every page and document call; they only change between runs.
+@lru_cache(maxsize=None)
 def load_prompt(name: str) -> str:
     """Load a prompt from the prompts directory."""
     path = PROMPTS_DIR / f"{name}.md"
@@ -48,26 +65,28 @@ def strip_markdown_fences(text: str) -> str:
 def extract_completion_text(completion: object, context: str) -> str:
     """Safely extract stripped text content from a chat completion."""
     if not completion:
-        logger.error(f"Missing completion response for {context}")
+        logger.error("Missing completion response for %s", context)
         return ""
 
     choices = getattr(completion, "choices", None)
     if not choices:
-        logger.error(f"Missing completion choices for {context}")
+        logger.error("Missing completion choices for %s", context)
         return ""
 
     message = getattr(choices[0], "message", None)
     if message is None:
-        logger.warning(f"Missing completion message for {context}")
+        logger.warning("Missing completion message for %s", context)
         return ""
 
     content = getattr(message, "content", None)
     if content is None:
-        logger.warning(f"Missing completion content for {context}")
+        logger.warning("Missing completion content for %s", context)
         return ""
 
     if not isinstance(content, str):
-        logger.warning(f"Non-string completion content for {context}: {type(content).__name__}")
+        logger.warning(
+            "Non-string completion content for %s: %s", context, type(content).__name__
+        )
         return ""
 
     return content.strip()
@@ -81,6 +100,43 @@ def require_completion_text(completion: object, context: str) -> str:
     return content
 
 
+def is_anthropic_model(model_id: str) -> bool:
+    """Return whether an OpenRouter model id routes to an Anthropic model."""
+    return model_id.startswith("anthropic/")
+
+
+def system_message(content: str, model_id: str) -> ChatCompletionSystemMessageParam:
+    """Build a system message, marking it as a prompt-cache breakpoint where needed.
+
+    OpenAI and Gemini cache repeated prefixes automatically; Anthropic models on
+    OpenRouter only cache content blocks that carry an explicit cache_control.
+    """
+    if not is_anthropic_model(model_id):
+        return {"role": "system", "content": content}
+    return cast(
+        ChatCompletionSystemMessageParam,
+        {
+            "role": "system",
+            "content": [
+                {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+            ],
+        },
+    )
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text via a temp file and rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
 def parse_json_mapping(text: str, context: str) -> dict[str, object]:
     """Parse a JSON object from model output."""
     raw = strip_markdown_fences(text)
@@ -93,11 +149,11 @@ def parse_json_mapping(text: str, context: str) -> dict[str, object]:
 def extract_dates_from_text(text: str) -> list[str]:
     """Extract YYYY-MM-DD dates from ISO, DD/MM/YYYY, and DD-MM-YYYY input."""
     dates = []
-    for match in re.finditer(r"\b(\d{4})-(\d{2})-(\d{2})\b", text):
+    for match in _ISO_DATE_PATTERN.finditer(text):
         year, month, day = match.groups()
         if 1900 <= int(year) <= 2100 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31:
             dates.append(f"{year}-{month}-{day}")
-    for match in re.finditer(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b", text):
+    for match in _DAY_FIRST_DATE_PATTERN.finditer(text):
         day, month, year = match.groups()
         day_int, month_int, year_int = int(day), int(month), int(year)
         if 1900 <= year_int <= 2100 and 1 <= month_int <= 12 and 1 <= day_int <= 31:
@@ -105,8 +161,45 @@ def extract_dates_from_text(text: str) -> list[str]:
     return dates
 
 
+class RequestRateLimiter:
+    """Thread-safe token bucket that paces API requests to a requests-per-minute budget."""
+
+    def __init__(self, requests_per_minute: int) -> None:
+        self._rate = requests_per_minute / 60
+        # Allow up to one second's worth of requests (at least one) to go out at once.
+        self._capacity = max(1.0, self._rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request slot is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Reserve the slot before sleeping so concurrent callers queue up behind it.
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+@atexit.register
+def _stop_file_log_listener() -> None:
+    """Flush queued records to the log files and close them."""
+    global _file_log_listener
+    if _file_log_listener is None:
+        return
+    _file_log_listener.stop()
+    for handler in _file_log_listener.handlers:
+        handler.close()
+    _file_log_listener = None
+
+
 def setup_logging(log_dir: Path, clear_logs: bool = False) -> logging.Logger:
     """Configure detailed file logging and warning-or-higher console logging."""
+    global _file_log_listener
     log_dir.mkdir(exist_ok=True)
     info_log_path = log_dir / "info.log"
     error_log_path = log_dir / "error.log"
@@ -122,6 +215,7 @@ def setup_logging(log_dir: Path, clear_logs: bool = False) -> logging.Logger:
     for handler in list(root_logger.handlers):
         root_logger.removeHandler(handler)
         handler.close()
+    _stop_file_log_listener()
 
     file_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     console_formatter = logging.Formatter("%(levelname)s: %(message)s")
@@ -138,8 +232,15 @@ def setup_logging(log_dir: Path, clear_logs: bool = False) -> logging.Logger:
     console_handler.setLevel(logging.WARNING)
     console_handler.setFormatter(console_formatter)
 
-    root_logger.addHandler(info_handler)
-    root_logger.addHandler(error_handler)
+    # Page and document workers log from many threads; queue file records so
+    # workers never block on disk writes. Console warnings stay synchronous.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _file_log_listener = logging.handlers.QueueListener(
+        log_queue, info_handler, error_handler, respect_handler_level=True
+    )
+    _file_log_listener.start()
+
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
     root_logger.addHandler(console_handler)
 
     return logging.getLogger(__name__)
@@ -1,5 +1,9 @@
+import logging
+import threading
+
 import pytest
 
+import parsemedicalexams.utils as utils
 from parsemedicalexams.cli import parse_args
 from parsemedicalexams.config import (
     DEFAULT_MODEL_ID,
@@ -46,6 +50,19 @@ def test_profile_config_ignores_legacy_model_and_workers_keys(tmp_path):
     assert profile.max_workers == 1
     assert profile.n_extractions == DEFAULT_N_EXTRACTIONS
     assert profile.summarize_max_input_tokens == DEFAULT_SUMMARIZE_MAX_INPUT_TOKENS
+    assert profile.requests_per_minute is None
+
+
+def test_profile_config_reads_requests_per_minute(tmp_path):
+    profile_path = tmp_path / "profile.yaml"
+    profile_path.write_text(
+        "name: test\nprocessing:\n  requests_per_minute: 45\n", encoding="utf-8"
+    )
+    invalid_path = tmp_path / "invalid.yaml"
+    invalid_path.write_text("name: test\nrequests_per_minute: 0\n", encoding="utf-8")
+
+    assert ProfileConfig.from_file(profile_path).requests_per_minute == 45
+    assert ProfileConfig.from_file(invalid_path).requests_per_minute is None
 
 
 def test_extraction_config_uses_default_model_when_legacy_profile_aliases_removed(tmp_path):
@@ -72,3 +89,30 @@ def test_extraction_config_uses_default_model_when_legacy_profile_aliases_remove
     extraction_config = ExtractionConfig.from_profile(profile)
 
     assert extraction_config.extract_model_id == DEFAULT_MODEL_ID
+
+
+def test_setup_logging_writes_worker_thread_records_to_log_files(tmp_path):
+    root_logger = logging.getLogger()
+    previous_handlers = list(root_logger.handlers)
+    previous_level = root_logger.level
+    try:
+        utils.setup_logging(tmp_path)
+        worker = threading.Thread(
+            target=lambda: logging.getLogger("worker").error("page %s failed", 3)
+        )
+        worker.start()
+        worker.join()
+        logging.getLogger("main").info("document done")
+        utils._stop_file_log_listener()
+
+        info_log = (tmp_path / "info.log").read_text(encoding="utf-8")
+        assert "worker - ERROR - page 3 failed" in info_log
+        assert "main - INFO - document done" in info_log
+        assert "document done" not in (tmp_path / "error.log").read_text(encoding="utf-8")
+    finally:
+        for handler in list(root_logger.handlers):
+            root_logger.removeHandler(handler)
+            handler.close()
+        for handler in previous_handlers:
+            root_logger.addHandler(handler)
+        root_logger.setLevel(previous_level)
@@ -1,15 +1,24 @@
+import os
 from types import SimpleNamespace
 
+import httpx
 import pytest
+from openai import APIStatusError
+from PIL import Image
 
+import parsemedicalexams.llm_cache as llm_cache
+import parsemedicalexams.standardization as standardization
 from parsemedicalexams.extraction import (
+    TRANSCRIPTION_MAX_TOKENS_CEILING,
     score_transcription_confidence,
+    transcribe_page,
     validate_transcription,
     vote_on_best_result,
 )
+from parsemedicalexams.models import ExamRecord
 from parsemedicalexams.standardization import standardize_exam_types
-from parsemedicalexams.summarization import _llm_summarize
-from parsemedicalexams.utils import extract_completion_text
+from parsemedicalexams.summarization import _llm_summarize, summarize_document
+from parsemedicalexams.utils import extract_completion_text, system_message
 
 
 def make_completion(content=None, include_choices=True, include_message=True):
@@ -127,8 +136,215 @@ def test_standardize_exam_types_rejects_invalid_exam_type_before_cache_write(mon
     assert saved == []
 
 
+def test_standardize_exam_types_sends_each_cache_key_once(monkeypatch):
+    prompts = []
+
+    def create(**kwargs):
+        prompts.append(kwargs["messages"][1]["content"])
+        return make_completion(
+            '{"RX Torax": {"exam_type": "imaging", "standardized_name": "Chest X-Ray"}}'
+        )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr("parsemedicalexams.standardization.load_cache", lambda name: {})
+    monkeypatch.setattr("parsemedicalexams.standardization.save_cache", lambda name, cache: None)
+
+    result = standardize_exam_types(["rx torax ", "RX Torax", "RX Torax", ""], "fake-model", client)
+
+    assert len(prompts) == 1
+    assert '"RX Torax"' in prompts[0]
+    assert "rx torax" not in prompts[0]
+    assert result["rx torax "] == result["RX Torax"] == ("imaging", "Chest X-Ray")
+
+
+def test_load_cache_reuses_parsed_file_until_it_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(standardization, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(standardization, "_LOADED_CACHES", {})
+    standardization.save_cache(
+        "names", {"rx torax": {"exam_type": "imaging", "standardized_name": "Chest X-Ray"}}
+    )
+    json_loads = []
+    real_load = standardization.json.load
+    monkeypatch.setattr(
+        standardization.json, "load", lambda handle: json_loads.append(1) or real_load(handle)
+    )
+
+    first = standardization.load_cache("names")
+    first["ecg"] = {"exam_type": "other", "standardized_name": "ECG"}
+    second = standardization.load_cache("names")
+    assert json_loads == []
+    assert list(second) == ["rx torax"]
+
+    cache_path = tmp_path / "names.json"
+    cache_path.write_text(
+        '{"rx torax": {"exam_type": "imaging", "standardized_name": "Chest Radiograph"}}',
+        encoding="utf-8",
+    )
+    os.utime(cache_path, ns=(0, cache_path.stat().st_mtime_ns + 1_000_000))
+
+    assert standardization.load_cache("names")["rx torax"]["standardized_name"] == (
+        "Chest Radiograph"
+    )
+    assert json_loads == [1]
+
+
 def test_llm_summarize_raises_on_empty_response():
     client = FakeClient(make_completion(None))
 
     with pytest.raises(RuntimeError, match="Missing completion text"):
         _llm_summarize([{"role": "user", "content": "hello"}], "fake-model", client)
+
+
+def test_summarize_document_maps_chunks_then_reduces():
+    exams = [
+        ExamRecord(
+            exam_name_raw=f"Exam {page}",
+            exam_date="2024-01-15",
+            transcription=f"Page {page} findings. " * 60,
+            page_number=page,
+            source_file="exam.pdf",
+            validation_status="ok",
+        )
+        for page in range(1, 4)
+    ]
+    prompts = []
+
+    def create(**kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        prompts.append(prompt)
+        if "PARTIAL SUMMARIES" in prompt:
+            return make_completion("Merged clinical summary covering every page of the document.")
+        page = prompt.split("(Page ", 1)[1].split(")", 1)[0]
+        return make_completion(f"Partial clinical summary for page {page} with its findings.")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    summary = summarize_document(exams, "fake-model", client, max_input_tokens=3000)
+
+    assert summary == "Merged clinical summary covering every page of the document."
+    assert len(prompts) == 4
+    reduce_prompt = prompts[-1]
+    assert "PARTIAL SUMMARIES (3)" in reduce_prompt
+    assert reduce_prompt.index("page 1 with") < reduce_prompt.index("page 3 with")
+
+
+def test_summarize_document_reuses_cached_summary(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path / "cache")
+    exams = [
+        ExamRecord(
+            exam_name_raw="RX Torax",
+            exam_date="2024-01-15",
+            transcription="Sem alterações pleuroparenquimatosas.",
+            page_number=1,
+            source_file="exam.pdf",
+            validation_status="ok",
+        )
+    ]
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["model"])
+        return make_completion("Chest X-ray from 2024-01-15 with no pleuroparenchymal changes.")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    first = summarize_document(exams, "fake-model", client, use_cache=True)
+    second = summarize_document(exams, "fake-model", client, use_cache=True)
+
+    assert first == second
+    assert calls == ["fake-model"]
+
+
+def test_summarize_document_sends_duplicate_pages_once():
+    consent = "Consentimento informado assinado."
+    exams = [
+        ExamRecord(
+            exam_name_raw="Consentimento",
+            exam_date="2024-01-15",
+            transcription=text,
+            page_number=page,
+            source_file="exam.pdf",
+            validation_status="ok",
+        )
+        for page, text in enumerate([consent, "ECG normal.", f"{consent}\n"], 1)
+    ]
+    prompts = []
+
+    def create(**kwargs):
+        prompts.append(kwargs["messages"][-1]["content"])
+        return make_completion("Signed consent form and a normal ECG from 2024-01-15.")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    summarize_document(exams, "fake-model", client)
+
+    assert len(prompts) == 1
+    assert prompts[0].count(consent) == 1
+    assert "(Page 3)" not in prompts[0]
+
+
+def test_transcribe_page_retries_at_ceiling_when_truncated(tmp_path):
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    truncated = make_completion("partial")
+    truncated.choices[0].finish_reason = "length"
+    complete = make_completion("full transcription")
+    complete.choices[0].finish_reason = "stop"
+    completions = [truncated, complete]
+    requested_budgets = []
+
+    def create(**kwargs):
+        requested_budgets.append(kwargs["max_tokens"])
+        return completions.pop(0)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    result = transcribe_page(image_path, "fake-model", client, max_tokens=2048)
+
+    assert result == "full transcription"
+    assert requested_budgets == [2048, TRANSCRIPTION_MAX_TOKENS_CEILING]
+
+
+def test_transcribe_page_logs_completion_usage_at_info(tmp_path, caplog):
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    completion = make_completion("transcription")
+    completion.usage = SimpleNamespace(completion_tokens=812)
+    client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: completion))
+    )
+
+    with caplog.at_level("INFO"):
+        transcribe_page(image_path, "fake-model", client)
+
+    assert "Completion tokens for transcription of exam.001.jpg: 812" in caplog.text
+
+
+def test_system_message_marks_cache_breakpoint_only_for_anthropic_models():
+    assert system_message("rules", "google/gemini-2.5-flash") == {
+        "role": "system",
+        "content": "rules",
+    }
+    anthropic_message = system_message("rules", "anthropic/claude-haiku-4.5")
+    assert anthropic_message["content"] == [
+        {"type": "text", "text": "rules", "cache_control": {"type": "ephemeral"}}
+    ]
+
+
+def test_transcribe_page_retries_at_half_resolution_when_image_too_large(tmp_path):
+    image_path = tmp_path / "exam.001.jpg"
+    Image.new("L", (800, 1000), "white").save(image_path, "JPEG")
+    sent_images = []
+
+    def create(**kwargs):
+        sent_images.append(kwargs["messages"][1]["content"][1]["image_url"]["url"])
+        if len(sent_images) == 1:
+            response = httpx.Response(413, request=httpx.Request("POST", "https://example.com"))
+            raise APIStatusError("Payload too large", response=response, body=None)
+        return make_completion("transcription")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    assert transcribe_page(image_path, "fake-model", client) == "transcription"
+    assert len(sent_images) == 2
+    assert len(sent_images[1]) < len(sent_images[0])
@@ -1,9 +1,15 @@
 import os
 import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from types import SimpleNamespace
 
 import pytest
+from PIL import Image
 
+import parsemedicalexams.document_io as document_io
 from parsemedicalexams.document_io import (
     collect_output_assertions,
     copy_source_pdf,
@@ -15,6 +21,7 @@ from parsemedicalexams.document_io import (
     save_transcription_file,
     validate_frontmatter,
     validate_orphan_output_dirs,
+    write_image_manifest,
     write_markdown_with_frontmatter,
 )
 from parsemedicalexams.models import ExamRecord
@@ -217,6 +224,43 @@ def test_get_document_output_issue_rejects_transcription_without_prompt_variant(
     )
 
 
+def test_get_document_output_issue_uses_manifest_page_count(tmp_path, monkeypatch):
+    source_pdf = tmp_path / "exam.pdf"
+    source_pdf.write_bytes(b"source")
+    monkeypatch.setattr(
+        "parsemedicalexams.document_io.count_pdf_pages",
+        lambda _: (_ for _ in ()).throw(AssertionError("PDF should not be opened")),
+    )
+
+    output_path = tmp_path / "out"
+    doc_dir = output_path / source_pdf.stem
+    doc_dir.mkdir(parents=True)
+    shutil.copy2(source_pdf, doc_dir / source_pdf.name)
+    (doc_dir / "exam.001.jpg").write_bytes(b"jpg")
+    (doc_dir / "exam.001.md").write_text("page 1\n", encoding="utf-8")
+    write_image_manifest(doc_dir, source_pdf, 2)
+
+    assert (
+        get_document_output_issue(source_pdf, output_path)
+        == "page image count mismatch (1 images, 2 PDF pages)"
+    )
+
+
+def test_validate_pipeline_outputs_keeps_input_order(tmp_path, monkeypatch):
+    pdf_files = [tmp_path / f"exam-{index}.pdf" for index in range(12)]
+    monkeypatch.setattr(
+        document_io,
+        "get_document_output_issue",
+        lambda pdf_path, output_path: None if pdf_path.stem.endswith("0") else "missing summary",
+    )
+
+    issues = document_io.validate_pipeline_outputs(pdf_files, tmp_path / "out")
+
+    assert issues == [
+        f"exam-{index}: missing summary" for index in range(12) if index not in (0, 10)
+    ]
+
+
 def test_extract_doc_date_prefix_reads_prefix():
     assert extract_doc_date_prefix("2025-08-22 - exame - questionario noite") == "2025-08-22"
     assert extract_doc_date_prefix("questionario noite") is None
@@ -503,6 +547,7 @@ def test_regenerate_summaries_reads_markdown_and_writes_summary(tmp_path, monkey
     config = SimpleNamespace(
         summarize_model_id="fake-model",
         summarize_max_input_tokens=1000,
+        document_workers=1,
     )
 
     total = regenerate_summaries(output_path, config, client=object())
@@ -511,3 +556,283 @@ def test_regenerate_summaries_reads_markdown_and_writes_summary(tmp_path, monkey
     summary_path = doc_dir / "exam.summary.md"
     assert summary_path.exists()
     assert "Comprehensive summary" in summary_path.read_text(encoding="utf-8")
+
+
+def test_regenerate_summaries_cancels_queued_documents_on_failure(tmp_path, monkeypatch):
+    output_path = tmp_path / "out"
+    doc_stems = ["exam-a", "exam-b", "exam-c"]
+    for doc_stem in doc_stems:
+        doc_dir = output_path / doc_stem
+        doc_dir.mkdir(parents=True)
+        save_transcription_file(
+            [make_exam(page_kind="text", source_file=f"{doc_stem}.pdf")], doc_dir, doc_stem, 1
+        )
+    submitted_docs = []
+    submitted = []
+    summarized = []
+    all_submitted = threading.Event()
+    queued_cancelled = threading.Event()
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, doc_dir):
+            submitted_docs.append(f"{doc_dir.name}.pdf")
+            future = super().submit(fn, doc_dir)
+            submitted.append(future)
+            if len(submitted) == len(doc_stems):
+                # The failing document's worker runs this callback before taking more
+                # work, so it holds until the queued documents have been cancelled.
+                submitted[0].add_done_callback(lambda f: queued_cancelled.wait(timeout=5))
+                future.add_done_callback(lambda f: queued_cancelled.set())
+                all_submitted.set()
+            return future
+
+    def summarize(exams, model_id, client, max_input_tokens):
+        summarized.append(exams[0].source_file)
+        all_submitted.wait(timeout=5)
+        raise RuntimeError("summary failed")
+
+    monkeypatch.setattr("parsemedicalexams.regeneration.summarize_document", summarize)
+    monkeypatch.setattr("parsemedicalexams.regeneration.ThreadPoolExecutor", RecordingExecutor)
+    config = SimpleNamespace(
+        summarize_model_id="fake-model",
+        summarize_max_input_tokens=1000,
+        document_workers=1,
+    )
+
+    with pytest.raises(RuntimeError, match="summary failed"):
+        regenerate_summaries(output_path, config, client=object())
+
+    assert summarized == submitted_docs[:1]
+    assert all(future.cancelled() for future in submitted[1:])
+
+
+def test_preprocess_pdf_images_to_temp_streams_rendered_pages(tmp_path, monkeypatch):
+    def fake_render(pdf_path, output_dir):
+        paths = []
+        for page_num in (1, 2):
+            path = output_dir / f"page-{page_num}.jpg"
+            Image.new("RGB", (2000, 1000), "white").save(path, "JPEG")
+            paths.append(path)
+        return paths
+
+    monkeypatch.setattr(document_io, "render_pdf_pages", fake_render)
+
+    temp_dir, image_paths = document_io.preprocess_pdf_images_to_temp(
+        tmp_path / "exam.pdf", "exam"
+    )
+    try:
+        assert [path.name for path in image_paths] == ["exam.001.jpg", "exam.002.jpg"]
+        with Image.open(image_paths[0]) as img:
+            assert img.mode == "L"
+            assert img.size == (1000, 500)
+        assert not list((image_paths[0].parent / "render").iterdir())
+    finally:
+        temp_dir.cleanup()
+
+
+def test_preprocess_pdf_images_to_temp_uses_shared_process_pool(tmp_path, monkeypatch):
+    page_count = document_io.PREPROCESS_POOL_MIN_PAGES
+
+    def fake_render(pdf_path, output_dir):
+        paths = []
+        for page_num in range(1, page_count + 1):
+            path = output_dir / f"page-{page_num}.jpg"
+            Image.new("RGB", (2000, 1000), "white").save(path, "JPEG")
+            paths.append(path)
+        return paths
+
+    monkeypatch.setattr(document_io, "render_pdf_pages", fake_render)
+    monkeypatch.setattr(document_io, "PDF_RENDER_THREADS", 2)
+    monkeypatch.setattr(document_io, "_preprocess_pool", None)
+
+    try:
+        for doc_stem in ("first", "second"):
+            temp_dir, image_paths = document_io.preprocess_pdf_images_to_temp(
+                tmp_path / f"{doc_stem}.pdf", doc_stem
+            )
+            try:
+                assert len(image_paths) == page_count
+                with Image.open(image_paths[-1]) as img:
+                    assert img.mode == "L"
+                    assert img.size == (1000, 500)
+            finally:
+                temp_dir.cleanup()
+            if doc_stem == "first":
+                pool = document_io._preprocess_pool
+        assert pool is not None
+        assert document_io._preprocess_pool is pool
+    finally:
+        document_io._shutdown_preprocess_pool()
+
+
+def test_preprocess_pdf_images_to_temp_recovers_from_broken_pool(tmp_path, monkeypatch):
+    page_count = document_io.PREPROCESS_POOL_MIN_PAGES
+
+    def fake_render(pdf_path, output_dir):
+        paths = []
+        for page_num in range(1, page_count + 1):
+            path = output_dir / f"page-{page_num}.jpg"
+            Image.new("RGB", (2000, 1000), "white").save(path, "JPEG")
+            paths.append(path)
+        return paths
+
+    class BrokenPool:
+        shut_down = False
+
+        def map(self, fn, *iterables):
+            # One page finishes before a worker dies, as with a real crash mid-document.
+            fn(*next(zip(*iterables)))
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    broken_pool = BrokenPool()
+    monkeypatch.setattr(document_io, "render_pdf_pages", fake_render)
+    monkeypatch.setattr(document_io, "PDF_RENDER_THREADS", 2)
+    monkeypatch.setattr(document_io, "_preprocess_pool", broken_pool)
+
+    temp_dir, image_paths = document_io.preprocess_pdf_images_to_temp(
+        tmp_path / "exam.pdf", "exam"
+    )
+    try:
+        assert all(path.exists() for path in image_paths)
+        assert len(image_paths) == page_count
+        assert not list((image_paths[0].parent / "render").iterdir())
+    finally:
+        temp_dir.cleanup()
+    assert broken_pool.shut_down
+    assert document_io._preprocess_pool is None
+
+
+def test_render_pdf_pages_prefers_pymupdf_when_installed(tmp_path, monkeypatch):
+    class FakePixmap:
+        width = 4
+        height = 2
+        samples = bytes(4 * 2 * 3)
+
+    class FakeDocument:
+        page_count = 2
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def load_page(self, index):
+            return SimpleNamespace(get_pixmap=lambda dpi: FakePixmap())
+
+    monkeypatch.setitem(
+        sys.modules, "pymupdf", SimpleNamespace(open=lambda path: FakeDocument())
+    )
+
+    rendered = document_io.render_pdf_pages(tmp_path / "exam.pdf", tmp_path)
+
+    assert [path.name for path in rendered] == ["page-0001.jpg", "page-0002.jpg"]
+    assert all(path.exists() for path in rendered)
+
+
+def test_count_pdf_pages_prefers_pymupdf_metadata(tmp_path, monkeypatch):
+    class FakeDocument:
+        page_count = 5
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setitem(
+        sys.modules, "pymupdf", SimpleNamespace(open=lambda path: FakeDocument())
+    )
+    monkeypatch.setitem(sys.modules, "pdf2image", None)
+    monkeypatch.setattr(document_io.shutil, "which", lambda name: None)
+
+    assert document_io.count_pdf_pages(tmp_path / "exam.pdf") == 5
+
+
+def test_count_pdf_pages_uses_pdfinfo_cli_without_pdf2image(tmp_path, monkeypatch):
+    def fail_render(*args, **kwargs):
+        raise AssertionError("page count should not rasterize the PDF")
+
+    monkeypatch.setitem(sys.modules, "pdf2image", None)
+    monkeypatch.setattr(document_io.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(
+        document_io.subprocess,
+        "run",
+        lambda *args, **kwargs: SimpleNamespace(
+            returncode=0, stdout="Title:          Exam\nPages:          12\nEncrypted:      no\n"
+        ),
+    )
+    monkeypatch.setattr(document_io, "convert_pdf_to_images", fail_render)
+
+    assert document_io.count_pdf_pages(tmp_path / "exam.pdf") == 12
+
+
+def test_persist_temp_images_moves_files_into_output_dir(tmp_path):
+    temp_dir = tmp_path / "temp"
+    doc_dir = tmp_path / "output" / "exam"
+    temp_dir.mkdir()
+    doc_dir.mkdir(parents=True)
+    temp_images = [temp_dir / f"exam.{page:03d}.jpg" for page in (1, 2)]
+    for image in temp_images:
+        image.write_bytes(image.name.encode())
+
+    persisted = document_io.persist_temp_images(temp_images, doc_dir)
+
+    assert persisted == [doc_dir / "exam.001.jpg", doc_dir / "exam.002.jpg"]
+    assert [path.read_bytes() for path in persisted] == [b"exam.001.jpg", b"exam.002.jpg"]
+    assert not any(image.exists() for image in temp_images)
+
+
+def test_transcription_files_match_stem_literally(tmp_path):
+    doc_stem = "2024-01-15 - exam [copy]"
+    for name in (
+        f"{doc_stem}.001.md",
+        f"{doc_stem}.002.md",
+        f"{doc_stem}.summary.md",
+        f"{doc_stem}.md",
+        f"{doc_stem}.001.jpg",
+        "other.001.md",
+    ):
+        (tmp_path / name).write_text("x", encoding="utf-8")
+
+    assert sorted(path.name for path in document_io.transcription_files(tmp_path, doc_stem)) == [
+        f"{doc_stem}.001.md",
+        f"{doc_stem}.002.md",
+    ]
+    assert [path.name for path in document_io.page_image_files(tmp_path, doc_stem)] == [
+        f"{doc_stem}.001.jpg"
+    ]
+    assert document_io.transcription_files(tmp_path / "missing", doc_stem) == []
+
+
+def test_iter_pdf_files_walks_subdirectories(tmp_path):
+    (tmp_path / "2024" / "scans").mkdir(parents=True)
+    (tmp_path / "a.pdf").write_bytes(b"pdf")
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "2024" / "b.pdf").write_bytes(b"pdf")
+    (tmp_path / "2024" / "scans" / "c.pdf").write_bytes(b"pdf")
+
+    found = sorted(
+        path.relative_to(tmp_path).as_posix() for path in document_io.iter_pdf_files(tmp_path)
+    )
+
+    assert found == ["2024/b.pdf", "2024/scans/c.pdf", "a.pdf"]
+
+
+def test_iter_pdf_files_does_not_follow_directory_symlinks(tmp_path):
+    (tmp_path / "2024").mkdir()
+    (tmp_path / "2024" / "b.pdf").write_bytes(b"pdf")
+    (tmp_path / "2024" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    (tmp_path / "alias").symlink_to(tmp_path / "2024", target_is_directory=True)
+    (tmp_path / "linked.pdf").symlink_to(tmp_path / "2024" / "b.pdf")
+    (tmp_path / "broken.pdf").symlink_to(tmp_path / "missing.pdf")
+    (tmp_path / "folder.pdf").mkdir()
+
+    found = sorted(
+        path.relative_to(tmp_path).as_posix() for path in document_io.iter_pdf_files(tmp_path)
+    )
+
+    assert found == ["2024/b.pdf", "linked.pdf"]
@@ -0,0 +1,271 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIStatusError
+from PIL import Image
+
+import parsemedicalexams.extraction as extraction
+import parsemedicalexams.llm_cache as llm_cache
+from parsemedicalexams.extraction import (
+    TRANSCRIPTION_MAX_TOKENS_CEILING,
+    _encode_image,
+    classify_document,
+    self_consistency,
+    transcribe_page_candidates,
+    transcribe_with_retry,
+)
+from parsemedicalexams.validation import OutputIssue
+
+
+def make_choice(content, finish_reason="stop"):
+    return SimpleNamespace(
+        message=SimpleNamespace(content=content),
+        finish_reason=finish_reason,
+    )
+
+
+def test_self_consistency_skips_voting_when_pair_agrees():
+    calls = []
+
+    def transcribe(image_name, temperature=0.1):
+        calls.append((threading.current_thread().name, temperature))
+        return f"transcription of {image_name}"
+
+    class NoVotingClient:
+        @property
+        def chat(self):
+            raise AssertionError("voting should not be called")
+
+    best, results = self_consistency(
+        transcribe,
+        "vote-model",
+        2,
+        "exam.001.jpg",
+        client=NoVotingClient(),
+    )
+
+    assert best == "transcription of exam.001.jpg"
+    assert results == [best, best]
+    assert len(calls) == 2
+    assert {temperature for _, temperature in calls} == {0.5}
+    assert threading.main_thread().name in {name for name, _ in calls}
+
+
+def test_transcribe_page_candidates_tops_up_missing_choices(tmp_path):
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    requested_n = []
+
+    def create(**kwargs):
+        requested_n.append(kwargs.get("n"))
+        if kwargs.get("n"):
+            return SimpleNamespace(choices=[make_choice("first")])
+        return SimpleNamespace(choices=[make_choice("topped up")])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    candidates = transcribe_page_candidates(image_path, "vision-model", client, 3)
+
+    assert candidates == ["first", "topped up", "topped up"]
+    assert requested_n == [3, None, None]
+
+
+def test_transcribe_page_candidates_retries_like_transcribe_page(tmp_path):
+    image_path = tmp_path / "exam.001.jpg"
+    Image.new("L", (800, 1000), "white").save(image_path, "JPEG")
+    requests = []
+
+    def create(**kwargs):
+        requests.append(
+            (
+                kwargs["n"],
+                kwargs["max_tokens"],
+                len(kwargs["messages"][1]["content"][1]["image_url"]["url"]),
+            )
+        )
+        if len(requests) == 1:
+            response = httpx.Response(413, request=httpx.Request("POST", "https://example.com"))
+            raise APIStatusError("Payload too large", response=response, body=None)
+        if len(requests) == 2:
+            return SimpleNamespace(
+                choices=[make_choice("first"), make_choice("cut off", finish_reason="length")]
+            )
+        return SimpleNamespace(choices=[make_choice("full"), make_choice("full")])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    candidates = transcribe_page_candidates(image_path, "vision-model", client, 2, max_tokens=2048)
+
+    assert candidates == ["full", "full"]
+    assert [(n, max_tokens) for n, max_tokens, _ in requests] == [
+        (2, 2048),
+        (2, 2048),
+        (2, TRANSCRIPTION_MAX_TOKENS_CEILING),
+    ]
+    # The 413 fallback sends a half-resolution image, and the ceiling retry reuses it.
+    assert requests[1][2] < requests[0][2]
+    assert requests[2][2] == requests[1][2]
+
+
+def test_transcribe_page_candidates_does_not_replay_blocking_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path / "cache")
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    responses = [
+        "This image shows an ultrasound report.",
+        "ECOGRAFIA ABDOMINAL: fígado de dimensões normais.",
+    ]
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["model"])
+        return SimpleNamespace(choices=[make_choice(responses[0]), make_choice(responses[0])])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    first = transcribe_page_candidates(image_path, "vision-model", client, 2, use_cache=True)
+    responses.pop(0)
+    second = transcribe_page_candidates(image_path, "vision-model", client, 2, use_cache=True)
+    third = transcribe_page_candidates(image_path, "vision-model", client, 2, use_cache=True)
+
+    assert first == ["This image shows an ultrasound report."] * 2
+    assert second == third == ["ECOGRAFIA ABDOMINAL: fígado de dimensões normais."] * 2
+    assert calls == ["vision-model", "vision-model"]
+
+
+def test_transcribe_with_retry_revalidates_cached_transcription(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path / "cache")
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    transcription = "RX TORAX PA Y LAT: sem alterações pleuroparenquimatosas."
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs["model"])
+        text = "no" if kwargs["model"] == "validation-model" else transcription
+        return SimpleNamespace(choices=[make_choice(text)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    transcribe_with_retry(image_path, "vision-model", client, "validation-model", use_cache=True)
+
+    # A stricter validation rule now flags the cached text, so it must not be replayed.
+    monkeypatch.setattr(
+        extraction,
+        "validate_page_output",
+        lambda text, **kwargs: [
+            OutputIssue("model_narration", "blocking", "page", None, "flagged")
+        ],
+    )
+    with pytest.raises(RuntimeError, match="invalid transcription"):
+        transcribe_with_retry(
+            image_path, "vision-model", client, "validation-model", max_retries=0, use_cache=True
+        )
+
+    assert requests == ["vision-model", "validation-model", "vision-model"]
+
+
+def test_transcribe_with_retry_reuses_cached_transcription(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path / "cache")
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    transcription = "RX TORAX PA Y LAT: sem alterações pleuroparenquimatosas."
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs["model"])
+        text = "no" if kwargs["model"] == "validation-model" else transcription
+        return SimpleNamespace(choices=[make_choice(text)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    first = transcribe_with_retry(
+        image_path, "vision-model", client, "validation-model", use_cache=True
+    )
+    second = transcribe_with_retry(
+        image_path, "vision-model", client, "validation-model", use_cache=True
+    )
+
+    assert first == second == (transcription, "transcription_system", 1)
+    assert requests == ["vision-model", "validation-model"]
+
+
+def test_transcribe_with_retry_transcribes_concurrent_duplicate_pages_once(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path / "cache")
+    image_paths = [tmp_path / "exam.001.jpg", tmp_path / "exam.002.jpg"]
+    for image_path in image_paths:
+        image_path.write_bytes(b"same page")
+    transcription = "ECG: ritmo sinusal, sem alterações da repolarização."
+    both_started = threading.Barrier(2)
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs["model"])
+        text = "no" if kwargs["model"] == "validation-model" else transcription
+        return SimpleNamespace(choices=[make_choice(text)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def transcribe(image_path):
+        both_started.wait()
+        return transcribe_with_retry(
+            image_path, "vision-model", client, "validation-model", use_cache=True
+        )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(transcribe, image_paths))
+
+    assert results == [(transcription, "transcription_system", 1)] * 2
+    assert requests == ["vision-model", "validation-model"]
+
+
+def test_classify_document_reuses_cached_classification(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", tmp_path / "cache")
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"jpg")
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs["model"])
+        tool_call = SimpleNamespace(
+            function=SimpleNamespace(
+                arguments=(
+                    '{"is_exam": true, "exam_name_raw": "RX TORAX", "exam_date": "15/01/2024"}'
+                )
+            )
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[tool_call]))]
+        )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    first = classify_document([image_path], "vision-model", client, use_cache=True)
+    second = classify_document([image_path], "vision-model", client, use_cache=True)
+
+    assert first == second
+    assert second.is_exam is True
+    assert second.exam_date == "2024-01-15"
+    assert requests == ["vision-model"]
+
+
+def test_encode_image_reuses_payload_until_file_changes(tmp_path):
+    image_path = tmp_path / "exam.001.jpg"
+    image_path.write_bytes(b"first")
+    first = _encode_image(image_path)["image_url"]["url"]
+    assert _encode_image(image_path)["image_url"]["url"] is first
+
+    image_path.write_bytes(b"second page")
+    assert _encode_image(image_path)["image_url"]["url"] != first
+
+
+def test_response_lock_is_shared_while_held_and_then_evicted():
+    lock = llm_cache.response_lock("transcriptions", "page-key")
+
+    assert llm_cache.response_lock("transcriptions", "page-key") is lock
+    del lock
+    assert ("transcriptions", "page-key") not in llm_cache._KEY_LOCKS
@@ -1,9 +1,15 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 
+import httpx
 import pytest
 
+import parsemedicalexams.document_io as document_io
 import parsemedicalexams.pipeline as pipeline
+import parsemedicalexams.utils as utils
 from parsemedicalexams.config import ExtractionConfig
 
 
@@ -17,7 +23,10 @@ def make_args(**overrides):
         reprocess_all=False,
         model=None,
         workers=None,
+        document_workers=None,
+        requests_per_minute=None,
         pattern=None,
+        no_cache=False,
     )
     for key, value in overrides.items():
         setattr(args, key, value)
@@ -109,6 +118,20 @@ def test_discover_pdf_files_raises_for_unreadable_input_dir(tmp_path, monkeypatc
         pipeline.discover_pdf_files(tmp_path, r".*\.pdf")
 
 
+def test_discover_pdf_files_applies_custom_pattern(tmp_path):
+    (tmp_path / "nested").mkdir()
+    for name in ["2024-01-15 - rx.pdf", "nested/notes.pdf", "scan.PDF", "readme.txt"]:
+        (tmp_path / name).write_bytes(b"x")
+
+    assert pipeline.discover_pdf_files(tmp_path, r".*\.pdf") == [
+        tmp_path / "2024-01-15 - rx.pdf",
+        tmp_path / "nested" / "notes.pdf",
+    ]
+    assert pipeline.discover_pdf_files(tmp_path, r"\d{4}-.*\.pdf") == [
+        tmp_path / "2024-01-15 - rx.pdf"
+    ]
+
+
 def test_select_documents_to_process_skips_complete_outputs(tmp_path, monkeypatch):
     processed = tmp_path / "done.pdf"
     pending = tmp_path / "todo.pdf"
@@ -132,6 +155,36 @@ def test_select_documents_to_process_skips_complete_outputs(tmp_path, monkeypatc
     assert already_processed == 1
 
 
+def test_select_documents_to_process_trusts_current_done_marker(tmp_path, monkeypatch):
+    marked = tmp_path / "marked.pdf"
+    changed = tmp_path / "changed.pdf"
+    marked.write_bytes(b"done")
+    changed.write_bytes(b"old")
+    output_path = tmp_path / "out"
+    for pdf_path in (marked, changed):
+        (output_path / pdf_path.stem).mkdir(parents=True)
+        pipeline.write_done_marker(output_path / pdf_path.stem, pdf_path)
+    changed.write_bytes(b"new bytes")
+    validated = []
+
+    def get_document_output_issue(pdf_path, output_path):
+        validated.append(pdf_path)
+        return "source PDF changed since last processing"
+
+    monkeypatch.setattr(pipeline, "get_document_output_issue", get_document_output_issue)
+
+    to_process, already_processed = pipeline.select_documents_to_process(
+        [marked, changed],
+        output_path,
+        document=None,
+        reprocess_all=False,
+    )
+
+    assert to_process == [changed]
+    assert already_processed == 1
+    assert validated == [changed]
+
+
 def test_select_documents_to_process_skips_missing_discovered_pdfs(tmp_path, monkeypatch):
     missing = tmp_path / "missing.pdf"
     pending = tmp_path / "todo.pdf"
@@ -178,6 +231,13 @@ def test_select_documents_to_process_skips_pdfs_removed_during_scan(tmp_path, mo
     assert already_processed == 0
 
 
+def test_extract_date_from_filename_prefers_iso_then_underscore_then_compact():
+    assert pipeline.extract_date_from_filename("20240101_scan_2024-02-03.pdf") == "2024-02-03"
+    assert pipeline.extract_date_from_filename("20240101_2024_02_03.pdf") == "2024-02-03"
+    assert pipeline.extract_date_from_filename("scan 20240101.pdf") == "2024-01-01"
+    assert pipeline.extract_date_from_filename("scan.pdf") is None
+
+
 def test_select_most_frequent_date_uses_filename_date_when_visible():
     exam = pipeline.ExamRecord(
         exam_name_raw="Mamografia digital directa e ecografia mamaria",
@@ -251,6 +311,201 @@ def test_process_single_pdf_discards_incomplete_existing_images(tmp_path, monkey
     assert not stale_image.exists()
 
 
+def test_process_single_pdf_discards_images_rendered_from_changed_pdf(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "exam.pdf"
+    pdf_path.write_bytes(b"old pdf")
+    output_path = tmp_path / "out"
+    doc_dir = output_path / "exam"
+    doc_dir.mkdir(parents=True)
+    config = make_runtime_config(tmp_path)
+    config.output_path = output_path
+
+    old_image = doc_dir / "exam.001.jpg"
+    old_image.write_bytes(b"old")
+    pipeline.write_image_manifest(doc_dir, pdf_path, 1)
+    assert pipeline.cached_image_page_count(doc_dir, pdf_path) == 1
+    pdf_path.write_bytes(b"new pdf bytes")
+
+    generated_image = tmp_path / "exam.001.jpg"
+    generated_image.write_bytes(b"generated")
+
+    class NonExamClassification:
+        is_exam = False
+        reason = "not an exam"
+
+    def fail_count(*args, **kwargs):
+        raise AssertionError("page count should come from the manifest check")
+
+    monkeypatch.setattr(pipeline, "count_pdf_pages", fail_count)
+    monkeypatch.setattr(
+        pipeline,
+        "preprocess_pdf_images_to_temp",
+        lambda *args, **kwargs: (
+            SimpleNamespace(cleanup=lambda: None),
+            [generated_image],
+        ),
+    )
+    monkeypatch.setattr(
+        pipeline, "classify_document", lambda *args, **kwargs: NonExamClassification()
+    )
+    monkeypatch.setattr(pipeline, "copy_source_pdf", lambda *args, **kwargs: None)
+
+    result = pipeline.process_single_pdf(pdf_path, output_path, config, client=object())
+
+    assert result == "skipped"
+    assert not old_image.exists()
+
+
+def test_process_single_pdf_records_manifest_for_reused_legacy_images(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "exam.pdf"
+    pdf_path.write_bytes(b"pdf")
+    output_path = tmp_path / "out"
+    doc_dir = output_path / "exam"
+    doc_dir.mkdir(parents=True)
+    config = make_runtime_config(tmp_path)
+    config.output_path = output_path
+    legacy_image = doc_dir / "exam.001.jpg"
+    legacy_image.write_bytes(b"legacy")
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("valid legacy images should be reused")
+
+    def fail_classification(*args, **kwargs):
+        raise RuntimeError("classification unavailable")
+
+    monkeypatch.setattr(pipeline, "count_pdf_pages", lambda *args, **kwargs: 1)
+    monkeypatch.setattr(pipeline, "preprocess_pdf_images_to_temp", fail_render)
+    monkeypatch.setattr(pipeline, "classify_document", fail_classification)
+
+    assert pipeline.process_single_pdf(pdf_path, output_path, config, client=object()) is None
+
+    assert legacy_image.exists()
+    assert pipeline.cached_image_page_count(doc_dir, pdf_path) == 1
+
+
+def test_process_single_pdf_hashes_drifted_pdf_copy_once(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "exam.pdf"
+    pdf_path.write_bytes(b"pdf")
+    output_path = tmp_path / "out"
+    doc_dir = output_path / "exam"
+    doc_dir.mkdir(parents=True)
+    config = make_runtime_config(tmp_path)
+    config.output_path = output_path
+    copied_pdf = doc_dir / "exam.pdf"
+    copied_pdf.write_bytes(b"pdf")
+    source_mtime_ns = pdf_path.stat().st_mtime_ns
+    os.utime(copied_pdf, ns=(source_mtime_ns, source_mtime_ns - 5_000_000_000))
+    generated_image = tmp_path / "exam.001.jpg"
+    generated_image.write_bytes(b"generated")
+    hashed = []
+    sha256_digest = document_io._sha256_digest
+
+    def counting_digest(path):
+        hashed.append(path.name)
+        return sha256_digest(path)
+
+    class NonExamClassification:
+        is_exam = False
+        reason = "not an exam"
+
+    monkeypatch.setattr(document_io, "_sha256_digest", counting_digest)
+    monkeypatch.setattr(
+        pipeline,
+        "preprocess_pdf_images_to_temp",
+        lambda *args, **kwargs: (SimpleNamespace(cleanup=lambda: None), [generated_image]),
+    )
+    monkeypatch.setattr(
+        pipeline, "classify_document", lambda *args, **kwargs: NonExamClassification()
+    )
+
+    result = pipeline.process_single_pdf(pdf_path, output_path, config, client=object())
+
+    assert result == "skipped"
+    assert hashed == ["exam.pdf", "exam.pdf"]
+
+
+def test_build_http_limits_keeps_a_connection_per_concurrent_call(tmp_path):
+    config = make_runtime_config(tmp_path)
+    assert pipeline.build_http_limits(config).max_keepalive_connections == 20
+
+    config.document_workers = 4
+    config.max_workers = 8
+    config.n_extractions = 3
+    limits = pipeline.build_http_limits(config)
+
+    assert limits.max_keepalive_connections == 96
+    assert limits.max_connections == 192
+
+
+def test_build_http_client_paces_requests_when_rate_limited(tmp_path, monkeypatch):
+    config = make_runtime_config(tmp_path)
+    assert pipeline.build_http_client(config).event_hooks["request"] == []
+
+    acquired = []
+    monkeypatch.setattr(pipeline.RequestRateLimiter, "acquire", lambda self: acquired.append(1))
+    config.requests_per_minute = 30
+    hooks = pipeline.build_http_client(config).event_hooks["request"]
+    hooks[0](httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions"))
+
+    assert acquired == [1]
+
+
+def test_request_rate_limiter_spaces_requests_after_burst(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(utils.time, "sleep", sleeps.append)
+    limiter = utils.RequestRateLimiter(requests_per_minute=30)
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+    clock[0] += 4.0
+    limiter.acquire()
+
+    assert sleeps == [2.0, 4.0, 2.0]
+
+
+def test_extract_visible_signal_labels_keeps_channels_and_settings():
+    text = "Fp1 - F7  F8-T4\nGain: 7 uV/mm LFF: 1 Hz Notch: 50 Hz\nPost HV 30 Sec Page: 3 2024"
+
+    assert pipeline._extract_visible_signal_labels(text, "2024-03-01") == [
+        "F8-T4",
+        "FP1 - F7",
+        "Gain: 7 uV/mm",
+        "LFF: 1 Hz",
+        "Notch: 50 Hz",
+        "Page: 3",
+        "Post HV 30 Sec",
+    ]
+    assert pipeline._extract_visible_signal_labels(text, "2019-03-01") == []
+    assert pipeline._extract_visible_signal_labels("Rhythm: sinus\nFP1-F7") == []
+
+
+def test_select_classification_pages_samples_first_middle_and_last():
+    pages = [Path(f"exam.{index:03d}.jpg") for index in range(1, 11)]
+
+    assert pipeline.select_classification_pages(pages[:3], 3) == pages[:3]
+    assert pipeline.select_classification_pages(pages, 3) == [pages[0], pages[4], pages[9]]
+    assert pipeline.select_classification_pages(pages, 1) == [pages[0]]
+
+
+def test_process_single_pdf_dry_run_counts_pages_without_rendering(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "exam.pdf"
+    pdf_path.write_bytes(b"pdf")
+    config = make_runtime_config(tmp_path)
+    config.dry_run = True
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("dry run should not rasterize pages")
+
+    monkeypatch.setattr("parsemedicalexams.document_io.render_pdf_pages", fail_render)
+    monkeypatch.setattr(pipeline, "preprocess_pdf_images_to_temp", fail_render)
+    monkeypatch.setattr(pipeline, "count_pdf_pages", lambda *args, **kwargs: 7)
+
+    assert pipeline.process_single_pdf(pdf_path, tmp_path / "output", config, client=None) == 7
+
+
 def test_run_profile_dry_run_uses_process_loop(tmp_path, monkeypatch):
     config = patch_profile_loading(monkeypatch, tmp_path)
     calls = []
@@ -274,6 +529,53 @@ def test_run_profile_dry_run_uses_process_loop(tmp_path, monkeypatch):
     assert len(calls) == 1
 
 
+def test_run_profile_interrupt_cancels_queued_documents(tmp_path, monkeypatch):
+    config = patch_profile_loading(monkeypatch, tmp_path)
+    pdf_paths = [config.input_path / f"exam-{index}.pdf" for index in range(5)]
+    processed = []
+    submitted = []
+    running_started = threading.Event()
+    queued_cancelled = threading.Event()
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            future = super().submit(fn, *args, **kwargs)
+            submitted.append(future)
+            future.add_done_callback(lambda f: f.cancelled() and queued_cancelled.set())
+            return future
+
+    def interrupt_while_second_runs(futures, **kwargs):
+        for future in futures:
+            yield future
+            running_started.wait(timeout=5)
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(pipeline, "discover_pdf_files", lambda *args, **kwargs: pdf_paths)
+    monkeypatch.setattr(
+        pipeline,
+        "select_documents_to_process",
+        lambda *args, **kwargs: (pdf_paths, 0),
+    )
+
+    def process(pdf_path, *args, **kwargs):
+        processed.append(pdf_path.name)
+        if pdf_path.name == "exam-1.pdf":
+            # Hold the running document until the queued ones have been cancelled.
+            running_started.set()
+            queued_cancelled.wait(timeout=5)
+        return 1
+
+    monkeypatch.setattr(pipeline, "process_single_pdf", process)
+    monkeypatch.setattr(pipeline, "tqdm", interrupt_while_second_runs)
+    monkeypatch.setattr(pipeline, "ThreadPoolExecutor", RecordingExecutor)
+
+    with pytest.raises(KeyboardInterrupt):
+        pipeline.run_profile("test", make_args())
+
+    assert processed == ["exam-0.pdf", "exam-1.pdf"]
+    assert all(future.cancelled() for future in submitted[2:])
+
+
 def test_run_profile_returns_false_for_unreadable_input_dir(tmp_path, monkeypatch):
     patch_profile_loading(monkeypatch, tmp_path)
     monkeypatch.setattr(
@@ -390,6 +692,37 @@ def test_run_profile_normal_processes_and_validates_outputs(tmp_path, monkeypatc
     assert processed == [pdf_path]
 
 
+def test_run_profile_processes_documents_concurrently(tmp_path, monkeypatch, capsys):
+    config = patch_profile_loading(monkeypatch, tmp_path)
+    pdf_paths = [config.input_path / f"exam{index}.pdf" for index in range(3)]
+    both_started = threading.Barrier(2, timeout=5)
+
+    monkeypatch.setattr(pipeline, "discover_pdf_files", lambda *args, **kwargs: pdf_paths)
+    monkeypatch.setattr(
+        pipeline,
+        "select_documents_to_process",
+        lambda *args, **kwargs: (pdf_paths, 0),
+    )
+
+    def process_single_pdf(pdf_path, *args, **kwargs):
+        if pdf_path != pdf_paths[2]:
+            both_started.wait()
+        return "skipped" if pdf_path == pdf_paths[1] else 2
+
+    monkeypatch.setattr(pipeline, "process_single_pdf", process_single_pdf)
+    monkeypatch.setattr(
+        pipeline,
+        "log_output_assertions_report",
+        lambda *args, **kwargs: True,
+    )
+
+    assert pipeline.run_profile("test", make_args(document_workers=2)) is True
+    assert config.document_workers == 2
+    output = capsys.readouterr().out
+    assert "Processed: 2 document(s), 4 page(s)" in output
+    assert "Skipped (not medical exams): 1" in output
+
+
 def test_process_single_pdf_skips_non_exam_without_reason_attribute(tmp_path, monkeypatch):
     pdf_path = tmp_path / "invoice.pdf"
     pdf_path.write_bytes(b"pdf")